@@ -0,0 +1,272 @@
+"""
+Benchmarks de los algoritmos de planificación de disco con seguimiento de regresiones
+Mide cada algoritmo de DiskScheduler, run_all_algorithms y save_all_plots con distintos
+tamaños y distribuciones de solicitudes, reporta ns por solicitud y memoria pico
+(tracemalloc), y compara contra un baseline en JSON
+
+Uso:
+    python benchmark.py --sizes 1e3 1e4 1e5 --baseline bench_baseline.json --update-baseline
+    python benchmark.py --sizes 1e3 1e4 1e5 --baseline bench_baseline.json --threshold 0.10
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from disk_scheduling import ALGORITHMS, DiskScheduler
+
+
+DEFAULT_SIZES = (10**3, 10**4, 10**5, 10**6, 10**7, 10**8)
+DISTRIBUTIONS = ('uniform', 'clustered', 'sequential', 'skewed')
+DEFAULT_THRESHOLD = 0.10  # 10% más lento (o más memoria) que el baseline = regresión
+
+# Qué se mide: cada algoritmo por separado más los dos puntos de entrada completos
+TARGETS = tuple(ALGORITHMS) + ('run_all_algorithms', 'save_all_plots')
+
+# Desde este tamaño, sin --targets solo se miden los algoritmos vectorizados: SSTF,
+# DEADLINE y ANTICIPATORY recorren las solicitudes en Python, y run_all_algorithms y
+# save_all_plots guardan ocho historiales a la vez (unos 3 GB con 1e8 solicitudes)
+HUGE_SIZE = 10**7
+HUGE_TARGETS = ('FCFS', 'SCAN', 'LOOK', 'C-SCAN', 'C-LOOK')
+
+
+def generate_workload(distribution, num_requests, num_cylinders, rng):
+    """
+    Genera solicitudes int32 con la distribución pedida
+
+    uniform: todos los cilindros igual de probables
+    clustered: unas pocas zonas calientes (mezcla de normales)
+    sequential: ráfagas de cilindros consecutivos que empiezan en lugares al azar
+    skewed: ley de potencia, casi todo cerca del cilindro 0
+    """
+    if distribution == 'uniform':
+        requests = rng.integers(0, num_cylinders, size=num_requests)
+    elif distribution == 'clustered':
+        centers = rng.integers(0, num_cylinders, size=8)
+        spread = max(1, num_cylinders // 50)
+        requests = rng.normal(centers[rng.integers(0, len(centers), size=num_requests)], spread)
+    elif distribution == 'sequential':
+        run_length = 64
+        starts = rng.integers(0, num_cylinders, size=num_requests // run_length + 1)
+        requests = (np.repeat(starts, run_length)[:num_requests] +
+                    np.tile(np.arange(run_length), len(starts))[:num_requests])
+    elif distribution == 'skewed':
+        requests = (num_cylinders - 1) * rng.power(0.2, size=num_requests)
+    else:
+        raise ValueError(f"Distribución desconocida: {distribution!r}. Opciones: {', '.join(DISTRIBUTIONS)}")
+
+    return np.clip(requests, 0, num_cylinders - 1).astype(np.int32)
+
+
+def _target_callable(scheduler, target, plots_dir):
+    """Devuelve una función sin argumentos que ejecuta lo que se quiere medir"""
+    if target in ALGORITHMS:
+        return getattr(scheduler, ALGORITHMS[target])
+    if target == 'run_all_algorithms':
+        return scheduler.run_all_algorithms
+    if target == 'save_all_plots':
+        import matplotlib
+        matplotlib.use('Agg')
+        from visualizations import save_all_plots
+        results = scheduler.run_all_algorithms()
+
+        def render():
+            with contextlib.redirect_stdout(io.StringIO()):
+                save_all_plots(scheduler, results, plots_dir, skip_unchanged=False)
+        return render
+    raise ValueError(f"Objetivo desconocido: {target!r}. Opciones: {', '.join(TARGETS)}")
+
+
+def time_call(func, repeat=3, setup=None):
+    """
+    Mejor tiempo (ns) de varias ejecuciones; el mínimo es lo menos ruidoso
+
+    setup() se llama antes de cada ejecución, fuera de la medición (por ejemplo para
+    descartar el índice ordenado que dejó la ejecución anterior).
+    """
+    best = None
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter_ns()
+        func()
+        elapsed = time.perf_counter_ns() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def peak_memory(func, setup=None):
+    """Memoria pico (bytes) durante una ejecución, según tracemalloc (NumPy también reporta ahí)"""
+    if setup is not None:
+        setup()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, distributions=DISTRIBUTIONS, targets=None, engine='numpy',
+                   num_cylinders=5000, initial_position=2500, repeat=3, measure_memory=True, seed=0):
+    """
+    Ejecuta todas las combinaciones tamaño × distribución × objetivo
+
+    Sin targets se miden todos los de TARGETS, o solo HUGE_TARGETS desde HUGE_SIZE.
+    Cada ejecución medida (y la pasada de memoria) empieza sin índice ordenado, así el
+    tiempo incluye ordenar las solicitudes como en un planificador recién creado.
+
+    Retorna:
+        Una lista de registros con ns_per_request y peak_bytes (None si no se midió)
+    """
+    records = []
+    with tempfile.TemporaryDirectory() as plots_dir:
+        for size in sizes:
+            for distribution in distributions:
+                rng = np.random.default_rng(seed)
+                requests = generate_workload(distribution, size, num_cylinders, rng)
+                if engine == 'python':
+                    requests = requests.tolist()
+
+                size_targets = targets
+                if size_targets is None:
+                    size_targets = HUGE_TARGETS if size >= HUGE_SIZE else TARGETS
+
+                for target in size_targets:
+                    # Un planificador nuevo por objetivo para no reutilizar el índice de otro
+                    scheduler = DiskScheduler(num_cylinders, initial_position=initial_position,
+                                              engine=engine, requests=requests)
+                    func = _target_callable(scheduler, target, plots_dir)
+                    elapsed = time_call(func, repeat, setup=scheduler.invalidate_index)
+                    records.append({
+                        'target': target,
+                        'distribution': distribution,
+                        'size': size,
+                        'engine': engine,
+                        'ns_per_request': elapsed / size,
+                        'peak_bytes': peak_memory(func, scheduler.invalidate_index) if measure_memory else None,
+                    })
+                    print(f"{target:>20} {distribution:>10} {size:>11} "
+                          f"{records[-1]['ns_per_request']:>10.1f} ns/solicitud", flush=True)
+    return records
+
+
+def measure_cold_start(module='disk_scheduling', runs=10):
+    """
+    Tiempo de arranque en frío: lanza un intérprete nuevo que solo importa el módulo
+
+    Retorna:
+        Un registro con el mejor tiempo en ns (size=1, para compararlo como los demás)
+    """
+    command = [sys.executable, '-c', f'import {module}']
+    directory = os.path.dirname(os.path.abspath(__file__))
+    baseline = time_call(lambda: subprocess.run([sys.executable, '-c', 'pass'], check=True), runs)
+    elapsed = time_call(lambda: subprocess.run(command, check=True, cwd=directory), runs)
+    record = {
+        'target': f'cold_start:{module}',
+        'distribution': '-',
+        'size': 1,
+        'engine': 'python',
+        'ns_per_request': elapsed,
+        'peak_bytes': None,
+    }
+    print(f"Arranque en frío de {module}: {elapsed / 1e6:.1f} ms "
+          f"({(elapsed - baseline) / 1e6:.1f} ms más que un intérprete vacío)")
+    return record
+
+
+def _record_key(record):
+    return f"{record['engine']}/{record['target']}/{record['distribution']}/{record['size']}"
+
+
+def save_baseline(records, path):
+    """Guarda los resultados como baseline JSON (una entrada por combinación)"""
+    with open(path, 'w') as baseline_file:
+        json.dump({_record_key(record): record for record in records}, baseline_file, indent=2, sort_keys=True)
+
+
+def load_baseline(path):
+    with open(path) as baseline_file:
+        return json.load(baseline_file)
+
+
+def find_regressions(records, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Compara contra el baseline
+
+    Retorna:
+        Una lista de mensajes, uno por métrica que empeoró más que el umbral
+    """
+    regressions = []
+    for record in records:
+        reference = baseline.get(_record_key(record))
+        if reference is None:
+            continue
+        for metric in ('ns_per_request', 'peak_bytes'):
+            current, previous = record.get(metric), reference.get(metric)
+            if current is None or not previous:
+                continue
+            change = current / previous - 1
+            if change > threshold:
+                regressions.append(f"{_record_key(record)}: {metric} {previous:.1f} -> {current:.1f} "
+                                   f"(+{change * 100:.1f}%)")
+    return regressions
+
+
+def _parse_size(value):
+    """Acepta tamaños como 1000, 1e6 o 1_000_000"""
+    return int(float(value.replace('_', '')))
+
+
+def main(argv=None):
+    """Función principal: ejecuta los benchmarks y falla (código 1) si hay regresiones"""
+    parser = argparse.ArgumentParser(description="Benchmarks de los algoritmos de planificación de disco")
+    parser.add_argument('--sizes', nargs='+', type=_parse_size, default=list(DEFAULT_SIZES))
+    parser.add_argument('--distributions', nargs='+', choices=DISTRIBUTIONS, default=list(DISTRIBUTIONS))
+    parser.add_argument('--targets', nargs='+', choices=TARGETS,
+                        help=f"Qué medir (por defecto todo; desde {HUGE_SIZE:_} solicitudes, {' '.join(HUGE_TARGETS)})")
+    parser.add_argument('--engine', choices=('python', 'numpy'), default='numpy')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--no-memory', action='store_true', help="No medir memoria pico (más rápido)")
+    parser.add_argument('--cold-start', action='store_true',
+                        help="Medir también el tiempo de importar disk_scheduling en un proceso nuevo")
+    parser.add_argument('--output', help="Guardar los resultados de esta corrida en JSON")
+    parser.add_argument('--baseline', help="Baseline JSON contra el cual comparar")
+    parser.add_argument('--update-baseline', action='store_true', help="Sobrescribir el baseline con esta corrida")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Empeoramiento relativo permitido (0.10 = 10%%)")
+    args = parser.parse_args(argv)
+
+    records = run_benchmarks(args.sizes, args.distributions, args.targets, args.engine,
+                             repeat=args.repeat, measure_memory=not args.no_memory)
+    if args.cold_start:
+        records.append(measure_cold_start())
+    if args.output:
+        save_baseline(records, args.output)
+
+    if args.baseline and args.update_baseline:
+        save_baseline(records, args.baseline)
+        print(f"\nBaseline actualizado: {args.baseline}")
+    elif args.baseline and os.path.exists(args.baseline):
+        regressions = find_regressions(records, load_baseline(args.baseline), args.threshold)
+        if regressions:
+            print(f"\nREGRESIONES (umbral {args.threshold * 100:.0f}%):")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print(f"\nSin regresiones respecto a {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
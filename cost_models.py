@@ -0,0 +1,190 @@
+"""
+Modelos de costo: convierten los movimientos del cabezal en tiempo (ms)
+Cada modelo precalcula una tabla con el tiempo de cada distancia posible de búsqueda
+(0 .. num_cylinders - 1), así que pasar de un historial a tiempos por paso es un solo
+acceso indexado de NumPy (table[distancias]) sin bucles de Python. El modelo lineal no
+necesita tabla: su total es el movimiento total por los ms de un cilindro. NumPy se
+importa recién al usar una tabla, como en disk_scheduling
+"""
+
+from disk_scheduling import MS_PER_CYLINDER, ScheduleResult
+
+
+# Pasos que total_ms() procesa juntos: los temporales caben en la caché del procesador
+STEP_CHUNK = 1 << 15
+
+
+class CostModel:
+    """
+    Base de los modelos de costo
+
+    Las subclases solo implementan seek_ms(distancias) vectorizado; la tabla se arma
+    con eso la primera vez que se usa.
+    """
+
+    name = None
+
+    def __init__(self, num_cylinders):
+        self.num_cylinders = num_cylinders
+        self._table = None
+
+    def seek_ms(self, distances):
+        """Tiempo (ms) de cada distancia en un arreglo de distancias"""
+        raise NotImplementedError
+
+    @property
+    def table(self):
+        """Tiempo de cada distancia posible, como arreglo float64 de num_cylinders elementos"""
+        import numpy as np
+        if self._table is None:
+            self._table = np.asarray(self.seek_ms(np.arange(self.num_cylinders, dtype=np.int64)),
+                                     dtype=np.float64)
+        return self._table
+
+    def _positions(self, result):
+        """
+        El historial como arreglo, verificando que la tabla cubra todas sus distancias
+
+        Ninguna distancia pasa de max - min, así que alcanza con dos reducciones. Con eso
+        verificado np.take usa mode='clip', que nunca llega a recortar y es el modo rápido:
+        mode='raise' con out= copia a un buffer intermedio y cuesta el doble.
+        """
+        import numpy as np
+        positions = np.asarray(result)
+        if len(positions) > 1:
+            span = int(positions.max()) - int(positions.min())
+            if span >= self.num_cylinders:
+                raise ValueError(f"El historial tiene distancias de hasta {span} cilindros; "
+                                 f"el modelo solo cubre hasta {self.num_cylinders - 1}")
+        return positions
+
+    def step_ms(self, result):
+        """
+        Tiempo de cada paso de un ScheduleResult (un elemento por movimiento del historial)
+
+        Las distancias se calculan directo como índices nativos (intp) para que np.take
+        no tenga que convertirlas. Si alguna pasa de num_cylinders - 1 da ValueError.
+        """
+        import numpy as np
+        positions = self._positions(result)
+        distances = np.empty(max(len(positions) - 1, 0), dtype=np.intp)
+        np.subtract(positions[1:], positions[:-1], out=distances, casting='unsafe')
+        np.abs(distances, out=distances)
+        return np.take(self.table, distances, mode='clip')
+
+    def total_ms(self, result):
+        """
+        Tiempo total de servicio de un ScheduleResult
+
+        Igual que step_ms(result).sum(), pero por trozos de STEP_CHUNK pasos con buffers
+        reutilizados: no arma el arreglo completo de tiempos.
+        """
+        import numpy as np
+        positions = self._positions(result)
+        table = self.table
+        steps = max(len(positions) - 1, 0)
+        distances = np.empty(min(steps, STEP_CHUNK), dtype=np.intp)
+        times = np.empty(len(distances), dtype=np.float64)
+
+        total = 0.0
+        for start in range(0, steps, STEP_CHUNK):
+            count = min(STEP_CHUNK, steps - start)
+            chunk = distances[:count]
+            np.subtract(positions[start + 1:start + 1 + count], positions[start:start + count],
+                        out=chunk, casting='unsafe')
+            np.abs(chunk, out=chunk)
+            total += np.take(table, chunk, out=times[:count], mode='clip').sum()
+        return float(total)
+
+    def average_ms(self, result, num_requests):
+        """
+        Tiempo promedio por solicitud (0 si no hubo solicitudes)
+
+        Se divide por num_requests, no por los pasos (ver ScheduleResult.average_service_ms).
+        """
+        return self.total_ms(result) / num_requests if num_requests > 0 else 0.0
+
+    def __repr__(self):
+        return f"{type(self).__name__}(num_cylinders={self.num_cylinders})"
+
+
+class LinearCostModel(CostModel):
+    """
+    El modelo del README: cada cilindro cuesta lo mismo (6 ms por defecto)
+
+    No usa tabla: el total sale del movimiento total del ScheduleResult en O(1) y los
+    pasos de sus distancias, así que cubre cualquier distancia y num_cylinders solo hace
+    falta para pedir .table. Un historial que no sea ScheduleResult (una lista o un
+    arreglo de posiciones) se recorre una vez con np.diff.
+    """
+
+    name = 'linear'
+
+    def __init__(self, num_cylinders=None, ms_per_cylinder=MS_PER_CYLINDER):
+        super().__init__(num_cylinders)
+        self.ms_per_cylinder = ms_per_cylinder
+
+    def seek_ms(self, distances):
+        return distances * self.ms_per_cylinder
+
+    def step_ms(self, result):
+        return _seek_distances(result) * self.ms_per_cylinder
+
+    def total_ms(self, result):
+        if isinstance(result, ScheduleResult):
+            return float(result.total_movement * self.ms_per_cylinder)
+        return float(_seek_distances(result).sum() * self.ms_per_cylinder)
+
+
+def _seek_distances(result):
+    """Distancias de cada paso de un ScheduleResult o de cualquier secuencia de posiciones"""
+    if isinstance(result, ScheduleResult):
+        return result.seek_distances
+    import numpy as np
+    return np.abs(np.diff(np.asarray(result, dtype=np.int64)))
+
+
+class AccelerationCostModel(CostModel):
+    """
+    Búsqueda con aceleración más latencia rotacional
+
+    Las búsquedas cortas están dominadas por la aceleración del brazo (crecen como la
+    raíz de la distancia) y las largas por la velocidad máxima (crecen linealmente).
+    Los valores por defecto son los del disco HP 97560 de Ruemmler y Wilkes, "An
+    introduction to disk drive modeling" (1994), con las dos curvas unidas cerca de
+    los 383 cilindros. A cada paso se le suma la latencia rotacional promedio (media
+    vuelta; 4.17 ms a 7200 rpm), aunque el cabezal no se haya movido.
+    """
+
+    name = 'acceleration'
+
+    def __init__(self, num_cylinders, short_seek_ms=3.24, short_seek_sqrt_ms=0.400, long_seek_ms=8.00,
+                 long_seek_linear_ms=0.008, switch_distance=383, rotational_latency_ms=60000 / 7200 / 2):
+        super().__init__(num_cylinders)
+        self.short_seek_ms = short_seek_ms
+        self.short_seek_sqrt_ms = short_seek_sqrt_ms
+        self.long_seek_ms = long_seek_ms
+        self.long_seek_linear_ms = long_seek_linear_ms
+        self.switch_distance = switch_distance
+        self.rotational_latency_ms = rotational_latency_ms
+
+    def seek_ms(self, distances):
+        import numpy as np
+        distances = np.asarray(distances, dtype=np.float64)
+        short = self.short_seek_ms + self.short_seek_sqrt_ms * np.sqrt(distances)
+        long = self.long_seek_ms + self.long_seek_linear_ms * distances
+        seek = np.where(distances < self.switch_distance, short, long)
+        # Sin movimiento no hay búsqueda, pero sí hay que esperar a que pase el sector
+        seek[distances == 0] = 0.0
+        return seek + self.rotational_latency_ms
+
+
+# Modelos disponibles por nombre (para la línea de comandos)
+COST_MODELS = {model.name: model for model in (LinearCostModel, AccelerationCostModel)}
+
+
+def get_cost_model(name, num_cylinders):
+    """Crea un modelo de COST_MODELS por su nombre con los parámetros por defecto"""
+    if name not in COST_MODELS:
+        raise ValueError(f"Modelo de costo desconocido: {name!r}. Opciones: {', '.join(COST_MODELS)}")
+    return COST_MODELS[name](num_cylinders)
@@ -0,0 +1,250 @@
+"""
+Simulación de un arreglo de discos (RAID-0, JBOD o reparto por hash)
+Reparte solicitudes lógicas entre varios discos, ejecuta los algoritmos de
+DiskScheduler en cada disco en paralelo y reporta el movimiento por disco, el total,
+el desbalance y el makespan (lo que tarda el disco más cargado)
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+
+from disk_scheduling import MS_PER_CYLINDER, DiskScheduler, StreamingTotals
+
+
+# Formas de repartir las direcciones lógicas entre los discos
+LAYOUTS = ('raid0', 'jbod', 'hash')
+
+# Solicitudes que se reparten de una vez; acota la memoria temporal del reparto
+DEFAULT_CHUNK_SIZE = 4_000_000
+
+# Constante de Fibonacci para el hash multiplicativo que baraja los discos de cada fila
+_HASH_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+
+
+class DiskArray:
+    """
+    Arreglo de num_disks discos iguales visto como un solo espacio lógico
+
+    Las direcciones lógicas van de 0 a num_disks × cylinders_per_disk - 1 y se agrupan
+    en franjas de stripe_cylinders cilindros:
+        raid0: las franjas se reparten en rueda (franja i -> disco i % num_disks)
+        jbod: los discos se concatenan (el disco 0 tiene las primeras direcciones)
+        hash: como raid0, pero en cada fila de num_disks franjas el orden de los discos es
+            una permutación pseudoaleatoria (por hash multiplicativo); cada disco sigue
+            recibiendo una franja por fila, así que el reparto es biyectivo
+    """
+
+    def __init__(self, num_disks, cylinders_per_disk=5000, layout='raid0', stripe_cylinders=1,
+                 initial_position=0):
+        if layout not in LAYOUTS:
+            raise ValueError(f"Distribución desconocida: {layout!r}. Opciones: {', '.join(LAYOUTS)}")
+        if num_disks < 1 or stripe_cylinders < 1:
+            raise ValueError("num_disks y stripe_cylinders deben ser al menos 1")
+        if cylinders_per_disk % stripe_cylinders:
+            raise ValueError("cylinders_per_disk debe ser múltiplo de stripe_cylinders")
+
+        self.num_disks = num_disks
+        self.cylinders_per_disk = cylinders_per_disk
+        self.layout = layout
+        self.stripe_cylinders = stripe_cylinders
+        self.initial_position = initial_position
+        self._row_permutations = None
+
+    @property
+    def num_cylinders(self):
+        """Tamaño del espacio lógico"""
+        return self.num_disks * self.cylinders_per_disk
+
+    @property
+    def row_permutations(self):
+        """
+        Con la distribución hash, el disco de cada franja según su fila y su lugar en ella
+
+        Es un arreglo (filas, num_disks) donde cada fila es una permutación de los discos,
+        ordenando un hash multiplicativo de (fila, lugar). Se arma una sola vez.
+        """
+        if self._row_permutations is None:
+            rows = self.cylinders_per_disk // self.stripe_cylinders
+            slots = np.arange(rows * self.num_disks, dtype=np.uint64).reshape(rows, self.num_disks)
+            mixed = (slots * _HASH_MULTIPLIER) >> np.uint64(32)
+            self._row_permutations = np.argsort(mixed, axis=1, kind='stable').astype(np.uint16)
+        return self._row_permutations
+
+    def map(self, requests):
+        """
+        Traduce direcciones lógicas a (disco, cilindro físico)
+
+        Retorna:
+            Una tupla (discos, cilindros) de arreglos de NumPy del mismo largo que requests
+        """
+        logical = np.asarray(requests, dtype=np.int64)
+        if len(logical) and (logical.min() < 0 or logical.max() >= self.num_cylinders):
+            raise ValueError(f"Hay direcciones fuera del arreglo (0 - {self.num_cylinders - 1})")
+
+        if self.layout == 'jbod':
+            disks, cylinders = np.divmod(logical, self.cylinders_per_disk)
+        else:
+            stripes, offsets = np.divmod(logical, self.stripe_cylinders)
+            rows, disks = np.divmod(stripes, self.num_disks)
+            if self.layout == 'hash':
+                # El cilindro dentro del disco queda igual que en raid0 (la fila); solo se
+                # baraja qué disco recibe cada lugar de la fila
+                disks = self.row_permutations[rows, disks]
+            cylinders = rows * self.stripe_cylinders + offsets
+
+        disk_dtype = np.uint8 if self.num_disks <= 256 else np.uint16
+        return disks.astype(disk_dtype), cylinders.astype(np.int32)
+
+    def shard(self, requests, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Reparte las solicitudes por disco conservando el orden de llegada en cada uno
+
+        Se procesa por trozos con un argsort estable (radix sobre el número de disco),
+        así la memoria extra no crece con el total de solicitudes.
+
+        Retorna:
+            Una lista con un arreglo int32 de cilindros físicos por disco
+        """
+        pieces = [[] for _ in range(self.num_disks)]
+        for start in range(0, len(requests), chunk_size):
+            disks, cylinders = self.map(requests[start:start + chunk_size])
+            order = np.argsort(disks, kind='stable')
+            bounds = np.searchsorted(disks[order], np.arange(self.num_disks + 1))
+            cylinders = cylinders[order]
+            for disk in range(self.num_disks):
+                if bounds[disk + 1] > bounds[disk]:
+                    pieces[disk].append(cylinders[bounds[disk]:bounds[disk + 1]])
+        return [np.concatenate(piece) if piece else np.empty(0, dtype=np.int32) for piece in pieces]
+
+
+def _run_disk(task):
+    """Ejecuta los algoritmos sobre el shard de un disco (también en un proceso trabajador)"""
+    shard, cylinders_per_disk, initial_position, algorithms, totals_only = task
+    scheduler = DiskScheduler(cylinders_per_disk, initial_position=initial_position, engine='numpy',
+                              requests=shard)
+    if totals_only:
+        return scheduler.totals(algorithms)
+    return {name: scheduler.run(name) for name in algorithms}
+
+
+class ArrayResult:
+    """Resultados por disco de una simulación de arreglo"""
+
+    def __init__(self, array, requests_per_disk, per_disk, ms_per_cylinder=MS_PER_CYLINDER):
+        self.array = array
+        self.requests_per_disk = requests_per_disk
+        # Una entrada por disco: {algoritmo: total} o {algoritmo: ScheduleResult}
+        self.per_disk = per_disk
+        self.ms_per_cylinder = ms_per_cylinder
+
+    @property
+    def algorithms(self):
+        return list(self.per_disk[0]) if self.per_disk else []
+
+    def disk_movements(self, algorithm):
+        """Movimiento total de cada disco con un algoritmo, como arreglo int64"""
+        return np.array([getattr(result[algorithm], 'total_movement', result[algorithm])
+                         for result in self.per_disk], dtype=np.int64)
+
+    def aggregate(self, algorithm):
+        """Suma del movimiento de todos los discos"""
+        return int(self.disk_movements(algorithm).sum())
+
+    def imbalance(self, algorithm):
+        """Movimiento del disco más cargado dividido por el promedio (1.0 = parejo)"""
+        movements = self.disk_movements(algorithm)
+        mean = movements.mean() if len(movements) else 0
+        return float(movements.max() / mean) if mean else 1.0
+
+    def makespan_ms(self, algorithm):
+        """Tiempo hasta que el último disco termina su cola (los discos trabajan a la vez)"""
+        return float(self.disk_movements(algorithm).max(initial=0) * self.ms_per_cylinder)
+
+    def summary(self):
+        """Diccionario {algoritmo: {aggregate, max_disk, imbalance, makespan_ms}}"""
+        return {
+            algorithm: {
+                'aggregate': self.aggregate(algorithm),
+                'max_disk': int(self.disk_movements(algorithm).max(initial=0)),
+                'imbalance': self.imbalance(algorithm),
+                'makespan_ms': self.makespan_ms(algorithm),
+            }
+            for algorithm in self.algorithms
+        }
+
+
+def simulate_array(array, requests, algorithms=None, totals_only=True, max_workers=None, executor='thread',
+                   chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Reparte las solicitudes en el arreglo y ejecuta los algoritmos en cada disco en paralelo
+
+    Parámetros:
+        array: DiskArray con la geometría y la distribución
+        requests: Direcciones lógicas (lista, arreglo o np.memmap de una traza)
+        algorithms: Algoritmos a ejecutar (por defecto los de fórmula cerrada,
+            StreamingTotals.CLOSED_FORM, que no ordenan ni recorren las solicitudes)
+        totals_only: Solo movimientos totales (lo que escala a 1e8 solicitudes); con False
+            cada disco guarda sus ScheduleResult completos
+        max_workers: Hilos o procesos (por defecto uno por núcleo; 1 = sin paralelismo)
+        executor: 'thread' (NumPy suelta el GIL al ordenar y reducir, y no hay que copiar
+            los shards) o 'process' (cada shard se copia al proceso trabajador)
+
+    Retorna:
+        Un ArrayResult
+    """
+    if executor not in ('thread', 'process'):
+        raise ValueError(f"Ejecutor desconocido: {executor!r}. Opciones: thread, process")
+    if algorithms is None:
+        algorithms = list(StreamingTotals.CLOSED_FORM)
+
+    shards = array.shard(requests, chunk_size)
+    tasks = [(shard, array.cylinders_per_disk, array.initial_position, algorithms, totals_only)
+             for shard in shards]
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    if max_workers == 1 or len(tasks) <= 1:
+        per_disk = [_run_disk(task) for task in tasks]
+    else:
+        pool = ThreadPoolExecutor if executor == 'thread' else ProcessPoolExecutor
+        with pool(max_workers=max_workers) as workers:
+            per_disk = list(workers.map(_run_disk, tasks))
+
+    return ArrayResult(array, np.array([len(shard) for shard in shards], dtype=np.int64), per_disk)
+
+
+def format_array_table(result):
+    """Tabla de texto con el resumen de cada algoritmo"""
+    lines = [['algoritmo', 'total', 'disco_max', 'desbalance', 'makespan_ms']]
+    for algorithm, row in result.summary().items():
+        lines.append([algorithm, str(row['aggregate']), str(row['max_disk']),
+                      f"{row['imbalance']:.3f}", f"{row['makespan_ms']:.1f}"])
+    widths = [max(len(line[i]) for line in lines) for i in range(len(lines[0]))]
+    return "\n".join("  ".join(cell.rjust(width) for cell, width in zip(line, widths)) for line in lines)
+
+
+def main():
+    """Función principal: compara las tres distribuciones con la misma carga"""
+    NUM_DISKS = 8
+    CYLINDERS_PER_DISK = 5000
+    NUM_REQUESTS = 1_000_000
+    INITIAL_POSITION = 2500
+
+    rng = np.random.default_rng(0)
+    requests = rng.integers(0, NUM_DISKS * CYLINDERS_PER_DISK, size=NUM_REQUESTS, dtype=np.int32)
+
+    results = {}
+    for layout in LAYOUTS:
+        array = DiskArray(NUM_DISKS, CYLINDERS_PER_DISK, layout, stripe_cylinders=8,
+                          initial_position=INITIAL_POSITION)
+        results[layout] = simulate_array(array, requests)
+        print(f"\n{layout} ({NUM_DISKS} discos, {NUM_REQUESTS} solicitudes):")
+        print(format_array_table(results[layout]))
+
+    return results
+
+
+if __name__ == "__main__":
+    results = main()
@@ -1,17 +1,90 @@
 """
 Implementación de Algoritmos de Planificación de Disco
-Este programa simula tres algoritmos diferentes para manejar las solicitudes de acceso al disco
+Este programa simula varios algoritmos (FCFS, SSTF, SCAN, LOOK, C-SCAN, C-LOOK, deadline y
+anticipatorio) para manejar las solicitudes de acceso al disco
 """
 
+import argparse
+import bisect
+import functools
+import hashlib
+import heapq
+import itertools
+import json
 import random
-import matplotlib.pyplot as plt
-import numpy as np
+import sys
+from array import array
+
+from instrumentation import NULL_INSTRUMENTATION
+
+# NumPy (motor 'numpy', ScheduleResult) y matplotlib (gráficas) se importan dentro de las
+# funciones que los usan: así una simulación con el motor 'python' arranca sin pagarlos
+
+
+# Motores de ejecución disponibles: 'python' recorre las solicitudes una por una,
+# 'numpy' arma el orden de servicio como arreglo int32 y suma los movimientos vectorizados
+ENGINES = ('python', 'numpy')
+
+# Costo de mover el cabezal un cilindro, como en la Pregunta 1 del README
+MS_PER_CYLINDER = 6.0
+
+# Nombre de cada algoritmo (como aparece en los resultados) y el método que lo implementa
+ALGORITHMS = {
+    'FCFS': 'fcfs',
+    'SSTF': 'sstf',
+    'SCAN': 'scan',
+    'LOOK': 'look',
+    'C-SCAN': 'c_scan',
+    'C-LOOK': 'c_look',
+    'DEADLINE': 'deadline',
+    'ANTICIPATORY': 'anticipatory',
+}
+
+# Algoritmos que se calculan por defecto en totals(), los barridos y los arreglos de
+# discos: los clásicos, que salen de fórmulas cerradas o del índice ordenado. DEADLINE y
+# ANTICIPATORY dependen del reloj y se recorren completos en Python, así que se piden aparte
+DEFAULT_ALGORITHMS = ('FCFS', 'SSTF', 'SCAN', 'LOOK', 'C-SCAN', 'C-LOOK')
+
+# Parámetros por defecto del planificador deadline (los mismos que usa Linux para lecturas)
+DEADLINE_EXPIRE_MS = 500.0
+DEADLINE_FIFO_BATCH = 16
+
+# Cuántas solicitudes "ve" a la vez el planificador anticipatorio por lotes
+ANTICIPATORY_WINDOW = 64
+
+# Solicitudes que se entregan juntas a StreamingTotals: con un memmap enorme solo se
+# convierte un trozo a la vez, así que la memoria temporal no crece con la carga
+STREAM_CHUNK_SIZE = 1_000_000
+
+# Versión del comportamiento de los algoritmos; forma parte de la clave de ResultCache,
+# así que hay que subirla cada vez que un algoritmo cambie sus resultados
+ALGORITHM_VERSION = 1
+
+
+def _instrumented(algorithm):
+    """
+    Decorador de los métodos de algoritmo: con la instrumentación activada mide la
+    fase y suma los contadores del resultado; desactivada es solo un if
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            instrumentation = self.instrumentation
+            if not instrumentation.enabled:
+                return method(self, *args, **kwargs)
+            with instrumentation.phase(algorithm):
+                result = method(self, *args, **kwargs)
+            instrumentation.record_result(result, self.num_requests)
+            return result
+        return wrapper
+    return decorator
 
 
 class DiskScheduler:
-    """Clase que simula el planificador de disco con tres algoritmos diferentes"""
+    """Clase que simula el planificador de disco con los algoritmos de ALGORITHMS"""
     
-    def __init__(self, num_cylinders=5000, num_requests=1000, initial_position=0):
+    def __init__(self, num_cylinders=5000, num_requests=1000, initial_position=0, engine='python',
+                 rng=None, requests=None, cache=None, instrumentation=None):
         """
         Inicializa nuestro planificador de disco
         
@@ -19,25 +92,189 @@ class DiskScheduler:
             num_cylinders: Cuántos cilindros tiene el disco (por defecto 5000, del 0 al 4999)
             num_requests: Cuántas solicitudes vamos a generar aleatoriamente
             initial_position: Dónde empieza el cabezal del disco
+            engine: Motor de ejecución, 'python' (bucles) o 'numpy' (vectorizado).
+                Ambos dan el mismo movimiento total y el mismo orden de servicio.
+            rng: Generador de NumPy (numpy.random.Generator) opcional. Si se da, las
+                solicitudes salen de él como arreglo int32 y son reproducibles; si no,
+                se usa el módulo random global como siempre.
+            requests: Solicitudes ya hechas (lista, arreglo o np.memmap de una traza).
+                Si se dan, no se genera nada aleatorio y num_requests se toma de ellas.
+                Con el motor 'python' los arreglos se pasan a una lista de enteros de Python.
+            cache: ResultCache opcional; run() y run_all_algorithms() la consultan antes
+                de ejecutar un algoritmo y guardan ahí lo que calculen.
+            instrumentation: Instrumentation opcional (ver instrumentation.py) para medir
+                fases y contar movimientos; por defecto desactivada y sin costo.
         """
+        if engine not in ENGINES:
+            raise ValueError(f"Motor desconocido: {engine!r}. Opciones: {', '.join(ENGINES)}")
+        
         self.num_cylinders = num_cylinders
         self.num_requests = num_requests
         self.initial_position = initial_position
+        self.engine = engine
+        self.cache = cache
+        self.instrumentation = instrumentation if instrumentation is not None else NULL_INSTRUMENTATION
+        
+        # Índice de la carga (ordenada, punto de corte e histograma); se arma cuando
+        # algún algoritmo lo pide y se descarta cuando cambian las solicitudes
+        self._workload_index = None
+        self._requests_digest = None
+        
+        # Carga incremental (conteos por cilindro) y cambios de add/cancel_requests que
+        # todavía no se aplicaron a la lista en orden de llegada
+        self._workload = None
+        self._pending_changes = []
         
         # Generamos las solicitudes aleatorias (números entre 0 y el máximo de cilindros)
-        self.requests = [random.randint(0, num_cylinders - 1) for _ in range(num_requests)]
+        with self.instrumentation.phase('generate'):
+            if requests is not None:
+                self.requests = requests
+            elif rng is not None:
+                import numpy as np
+                self.requests = rng.integers(0, num_cylinders, size=num_requests, dtype=np.int32)
+            else:
+                self.requests = [random.randint(0, num_cylinders - 1) for _ in range(num_requests)]
+    
+    @property
+    def requests(self):
+        """Lista (o arreglo) de solicitudes en orden de llegada"""
+        if self._pending_changes:
+            from incremental import apply_changes
+            self._requests = apply_changes(self._requests, self._pending_changes)
+            self._pending_changes = []
+        return self._requests
+    
+    @requests.setter
+    def requests(self, requests):
+        if self.engine == 'python' and hasattr(requests, 'dtype'):
+            # Los bucles del motor 'python' suman lo que reciben: con escalares int32 de
+            # NumPy el total se desbordaría sin avisar, con enteros de Python no
+            requests = requests.tolist()
+        # Reasignar las solicitudes invalida el índice precalculado
+        self._requests = requests
+        self.num_requests = len(requests)
+        self._workload_index = None
+        self._requests_digest = None
+        self._workload = None
+        self._pending_changes = []
+    
+    @property
+    def workload_index(self):
+        """
+        Índice compartido por todos los algoritmos: se ordena una sola vez y se reutiliza
+        
+        Si se modifican las solicitudes en el lugar (por ejemplo con append), hay que
+        llamar a invalidate_index(); reasignar self.requests lo invalida solo.
+        """
+        index = self._workload_index
+        if index is None or not index.matches(self):
+            with self.instrumentation.phase('index'):
+                index = self._build_index()
+            self._workload_index = index
+        return index
+    
+    def _build_index(self):
+        if self._workload is not None and self._workload.num_cylinders == self.num_cylinders:
+            # Después de add/cancel_requests los conteos ya dan el orden sin ordenar
+            return WorkloadIndex.from_sorted(self._workload.sorted_requests(self.engine),
+                                             self.initial_position, self.num_cylinders, self.engine)
+        return WorkloadIndex(self.requests, self.initial_position, self.num_cylinders, self.engine)
+    
+    @property
+    def optimal_total(self):
+        """
+        Movimiento mínimo posible para atender esta carga (ver optimal_movement)
+        
+        Sale del mínimo y el máximo: O(log N) si existe self.workload, si no una pasada O(n).
+        """
+        source = self._workload
+        if source is None:
+            source = StreamingTotals(self.initial_position, self.num_cylinders)
+            source.feed_chunks(self.requests)
+        return optimal_movement(self.initial_position, source.minimum, source.maximum)
+    
+    def invalidate_index(self):
+        """Descarta el índice precalculado para que se vuelva a armar en el próximo uso"""
+        self._workload_index = None
+        self._requests_digest = None
+        self._workload = None
+    
+    @property
+    def workload(self):
+        """
+        IncrementalWorkload con los conteos por cilindro (se arma la primera vez, en O(n + N))
+        
+        Mientras exista, add_requests() y cancel_requests() lo mantienen al día en
+        O(k log N) y totals() saca de él SCAN, LOOK, C-SCAN y C-LOOK sin recorrer la carga.
+        """
+        workload = self._workload
+        if (workload is None or workload.initial_position != self.initial_position or
+                workload.num_cylinders != self.num_cylinders):
+            from incremental import IncrementalWorkload
+            workload = IncrementalWorkload(self.requests, self.initial_position, self.num_cylinders)
+            self._workload = workload
+        return workload
+    
+    def add_requests(self, cylinders):
+        """
+        Agrega solicitudes al final de la cola en O(k log N), sin volver a ordenar
+        
+        Lanza ValueError si algún cilindro no existe en el disco.
+        """
+        cylinders = [int(cylinder) for cylinder in cylinders]
+        self.workload.add(cylinders)
+        self._record_change('add', cylinders)
     
+    def cancel_requests(self, cylinders):
+        """
+        Cancela una solicitud pendiente por cada cilindro dado (la más antigua de ese cilindro)
+        
+        Lanza ValueError, sin cambiar nada, si algún cilindro no tiene suficientes
+        solicitudes pendientes.
+        """
+        cylinders = [int(cylinder) for cylinder in cylinders]
+        self.workload.cancel(cylinders)
+        self._record_change('cancel', cylinders)
+    
+    def _record_change(self, operation, cylinders):
+        # La lista en orden de llegada se actualiza recién cuando alguien la lee
+        self._pending_changes.append((operation, cylinders))
+        self.num_requests = self._workload.count
+        self._workload_index = None
+        self._requests_digest = None
+    
+    @property
+    def requests_digest(self):
+        """
+        Hash (hex) de las solicitudes como int32, igual para ambos motores
+        
+        Se calcula una vez y se invalida junto con el índice.
+        """
+        if self._requests_digest is None:
+            requests = self.requests
+            if isinstance(requests, (list, tuple)):
+                data = array('i', requests)
+            else:
+                import numpy as np
+                data = np.ascontiguousarray(requests, dtype=np.int32)
+            self._requests_digest = hashlib.blake2b(data, digest_size=20).hexdigest()
+        return self._requests_digest
+    
+    @_instrumented('FCFS')
     def fcfs(self):
         """
         FCFS - First Come First Served (El primero que llega, primero se atiende)
         Este es el algoritmo más simple: atendemos las solicitudes en el orden que llegaron
         
         Retorna:
-            Una tupla con (movimiento_total, historial_de_posiciones)
+            Un ScheduleResult con el historial de posiciones y el movimiento total
         """
+        if self.engine == 'numpy':
+            return self._fcfs_numpy()
+        
         current_position = self.initial_position
         total_movement = 0
-        positions_history = [current_position]
+        positions_history = array('i', [current_position])
         
         # Recorremos cada solicitud en el orden que llegó
         for request in self.requests:
@@ -47,46 +284,56 @@ class DiskScheduler:
             current_position = request
             positions_history.append(current_position)
         
-        return total_movement, positions_history
+        return ScheduleResult('FCFS', positions_history, total_movement)
     
+    @_instrumented('SCAN')
     def scan(self):
         """
         SCAN - Algoritmo del Ascensor
         El cabezal se mueve en una dirección atendiendo solicitudes hasta llegar al final,
-        luego se devuelve atendiendo las que quedaron pendientes
+        luego se devuelve atendiendo las que quedaron pendientes.
+        Si no quedan solicitudes a la izquierda no hace falta llegar hasta el final.
         
         Retorna:
-            Una tupla con (movimiento_total, historial_de_posiciones)
+            Un ScheduleResult con el historial de posiciones y el movimiento total
         """
+        if self.engine == 'numpy':
+            return self._scan_numpy()
+        
         current_position = self.initial_position
         total_movement = 0
-        positions_history = [current_position]
-        
-        # Primero ordenamos todas las solicitudes
-        sorted_requests = sorted(self.requests)
+        positions_history = array('i', [current_position])
         
-        # Las dividimos en dos grupos: las que están a la izquierda y a la derecha de donde empezamos
-        left_requests = [r for r in sorted_requests if r < self.initial_position]
-        right_requests = [r for r in sorted_requests if r >= self.initial_position]
+        # El índice ya tiene las solicitudes ordenadas y divididas en dos grupos:
+        # las que están a la izquierda y a la derecha de donde empezamos
+        index = self.workload_index
         
         # Primero vamos hacia la derecha (hacia los cilindros más altos)
-        if right_requests:
-            for request in right_requests:
+        if index.num_right:
+            for request in index.right():
                 movement = abs(current_position - request)
                 total_movement += movement
                 current_position = request
                 positions_history.append(current_position)
         
-        # Luego nos devolvemos hacia la izquierda (hacia los cilindros más bajos)
-        if left_requests:
-            for request in reversed(left_requests):
+        # Luego nos devolvemos hacia la izquierda (hacia los cilindros más bajos),
+        # pero el ascensor primero llega hasta el último cilindro antes de dar la vuelta
+        if index.num_left:
+            if current_position != self.num_cylinders - 1:
+                movement = abs(current_position - (self.num_cylinders - 1))
+                total_movement += movement
+                current_position = self.num_cylinders - 1
+                positions_history.append(current_position)
+            
+            for request in index.left_descending():
                 movement = abs(current_position - request)
                 total_movement += movement
                 current_position = request
                 positions_history.append(current_position)
         
-        return total_movement, positions_history
+        return ScheduleResult('SCAN', positions_history, total_movement)
     
+    @_instrumented('C-SCAN')
     def c_scan(self):
         """
         C-SCAN - SCAN Circular
@@ -95,22 +342,22 @@ class DiskScheduler:
         se teletransporta al primero.
         
         Retorna:
-            Una tupla con (movimiento_total, historial_de_posiciones)
+            Un ScheduleResult con el historial de posiciones y el movimiento total
         """
+        if self.engine == 'numpy':
+            return self._c_scan_numpy()
+        
         current_position = self.initial_position
         total_movement = 0
-        positions_history = [current_position]
+        positions_history = array('i', [current_position])
         
-        # Ordenamos todas las solicitudes
-        sorted_requests = sorted(self.requests)
-        
-        # Las separamos: las que están antes y después de donde empezamos
-        left_requests = [r for r in sorted_requests if r < self.initial_position]
-        right_requests = [r for r in sorted_requests if r >= self.initial_position]
+        # Las solicitudes ordenadas y separadas (antes y después de donde empezamos)
+        # vienen del índice compartido
+        index = self.workload_index
         
         # Primero vamos hacia la derecha hasta el final del disco
-        if right_requests:
-            for request in right_requests:
+        if index.num_right:
+            for request in index.right():
                 movement = abs(current_position - request)
                 total_movement += movement
                 current_position = request
@@ -124,53 +371,883 @@ class DiskScheduler:
             positions_history.append(current_position)
         
         # Aquí viene lo circular: saltamos al cilindro 0
-        if left_requests:
+        if index.num_left:
             movement = current_position  # Del último cilindro al 0
             total_movement += movement
             current_position = 0
             positions_history.append(current_position)
             
             # Ahora atendemos las solicitudes que quedaron desde el cilindro 0
-            for request in left_requests:
+            for request in index.left():
                 movement = abs(current_position - request)
                 total_movement += movement
                 current_position = request
                 positions_history.append(current_position)
         
-        return total_movement, positions_history
+        return ScheduleResult('C-SCAN', positions_history, total_movement)
+    
+    @_instrumented('SSTF')
+    def sstf(self):
+        """
+        SSTF - Shortest Seek Time First (Primero el de menor búsqueda)
+        Siempre atendemos la solicitud pendiente más cercana al cabezal.
+        
+        Truco: como el disco es una línea, las solicitudes ya atendidas siempre forman
+        un bloque contiguo dentro de la lista ordenada. Así que basta con dos punteros
+        (vecino izquierdo y vecino derecho) y cada elección cuesta O(1) después de ordenar.
+        En caso de empate preferimos ir hacia la derecha, igual que SCAN.
+        
+        Retorna:
+            Un ScheduleResult con el historial de posiciones y el movimiento total
+        """
+        if self.engine == 'numpy':
+            return self._sstf_numpy()
+        
+        current_position = self.initial_position
+        total_movement = 0
+        positions_history = array('i', [current_position])
+        
+        index = self.workload_index
+        
+        for request in _iter_sstf_order(index.sorted_requests, index.split, self.initial_position):
+            movement = abs(current_position - request)
+            total_movement += movement
+            current_position = request
+            positions_history.append(current_position)
+        
+        return ScheduleResult('SSTF', positions_history, total_movement)
+    
+    @_instrumented('LOOK')
+    def look(self):
+        """
+        LOOK - Como SCAN, pero el cabezal solo llega hasta la última solicitud
+        en cada dirección (no hasta el final del disco) antes de devolverse
+        
+        Retorna:
+            Un ScheduleResult con el historial de posiciones y el movimiento total
+        """
+        if self.engine == 'numpy':
+            return self._look_numpy()
+        
+        current_position = self.initial_position
+        total_movement = 0
+        positions_history = array('i', [current_position])
+        
+        index = self.workload_index
+        
+        # Hacia la derecha y luego de vuelta hacia la izquierda, sin tocar los extremos
+        for request in itertools.chain(index.right(), index.left_descending()):
+            movement = abs(current_position - request)
+            total_movement += movement
+            current_position = request
+            positions_history.append(current_position)
+        
+        return ScheduleResult('LOOK', positions_history, total_movement)
+    
+    @_instrumented('C-LOOK')
+    def c_look(self):
+        """
+        C-LOOK - Como C-SCAN, pero en vez de ir hasta el final y saltar al cilindro 0,
+        salta directamente desde la última solicitud de la derecha a la primera de la izquierda
+        
+        Retorna:
+            Un ScheduleResult con el historial de posiciones y el movimiento total
+        """
+        if self.engine == 'numpy':
+            return self._c_look_numpy()
+        
+        current_position = self.initial_position
+        total_movement = 0
+        positions_history = array('i', [current_position])
+        
+        index = self.workload_index
+        
+        # El salto circular cuenta como movimiento, igual que en C-SCAN
+        for request in itertools.chain(index.right(), index.left()):
+            movement = abs(current_position - request)
+            total_movement += movement
+            current_position = request
+            positions_history.append(current_position)
+        
+        return ScheduleResult('C-LOOK', positions_history, total_movement)
+    
+    @_instrumented('DEADLINE')
+    def deadline(self, expire_ms=DEADLINE_EXPIRE_MS, fifo_batch=DEADLINE_FIFO_BATCH,
+                 ms_per_cylinder=MS_PER_CYLINDER):
+        """
+        DEADLINE - Planificador con fecha límite, al estilo del de Linux
+        
+        Mantiene dos colas: una ordenada por cilindro (el ascensor, que siempre sube y al
+        llegar arriba vuelve a la solicitud más baja) y una FIFO ordenada por fecha límite
+        (llegada + expire_ms). Se despachan lotes de fifo_batch solicitudes siguiendo el
+        ascensor; antes de cada lote, si la solicitud más vieja ya venció, el ascensor
+        salta hasta ella. El reloj avanza ms_per_cylinder por cada cilindro recorrido.
+        
+        Como en los demás algoritmos, todas las solicitudes llegan en t=0 en el orden de
+        self.requests. La FIFO es un montículo y el ascensor usa "siguiente pendiente"
+        con compresión de caminos, así que cada despacho cuesta O(log n).
+        
+        Retorna:
+            Un ScheduleResult con el historial de posiciones y el movimiento total
+        """
+        requests, order = self._arrival_list_and_order()
+        n = len(requests)
+        sorted_requests = self.workload_index.sorted_requests
+        if self.engine == 'numpy':
+            sorted_requests = sorted_requests.tolist()
+        rank = [0] * n  # Posición de cada solicitud dentro del ascensor
+        for position, request_id in enumerate(order):
+            rank[request_id] = position
+        
+        # next_pending[k] apunta hacia la primera posición >= k que sigue pendiente (n = ninguna)
+        next_pending = list(range(n + 1))
+        
+        def find(k):
+            while next_pending[k] != k:
+                next_pending[k] = next_pending[next_pending[k]]
+                k = next_pending[k]
+            return k
+        
+        # FIFO de vencimientos: (fecha_límite, orden_de_llegada)
+        fifo = [(expire_ms, request_id) for request_id in range(n)]
+        heapq.heapify(fifo)
+        served = bytearray(n)
+        
+        current_position = self.initial_position
+        total_movement = 0
+        positions_history = array('i', [current_position])
+        now = 0.0
+        cursor = bisect.bisect_left(sorted_requests, current_position)
+        remaining = n
+        
+        while remaining:
+            # Las solicitudes ya atendidas por el ascensor se sacan de la FIFO al pasar
+            while fifo and served[fifo[0][1]]:
+                heapq.heappop(fifo)
+            if fifo and fifo[0][0] <= now:
+                cursor = rank[fifo[0][1]]
+            
+            for _ in range(min(fifo_batch, remaining)):
+                k = find(cursor)
+                if k == n:
+                    k = find(0)  # El ascensor vuelve a empezar desde abajo
+                request = sorted_requests[k]
+                movement = abs(current_position - request)
+                total_movement += movement
+                now += movement * ms_per_cylinder
+                current_position = request
+                positions_history.append(current_position)
+                
+                served[order[k]] = 1
+                next_pending[k] = k + 1
+                cursor = k + 1
+                remaining -= 1
+        
+        return self._wrap_history('DEADLINE', positions_history, total_movement)
+    
+    @_instrumented('ANTICIPATORY')
+    def anticipatory(self, window=ANTICIPATORY_WINDOW):
+        """
+        ANTICIPATORY - Variante anticipatoria / por lotes
+        
+        En vez de conocer toda la cola, el planificador solo tiene a la vista las
+        próximas `window` solicitudes en orden de llegada (como la profundidad de cola
+        de un disco real) y espera a tener esa ventana llena antes de decidir. Dentro
+        de la ventana barre como LOOK con un montículo por dirección; cada vez que
+        atiende una, entra la siguiente que llegó. Despachar cuesta O(log window).
+        
+        Retorna:
+            Un ScheduleResult con el historial de posiciones y el movimiento total
+        """
+        requests, _ = self._arrival_list_and_order(sort=False)
+        n = len(requests)
+        up, down = [], []  # Delante del cabezal (mínimo arriba) y detrás (máximo arriba)
+        direction = 1
+        
+        current_position = self.initial_position
+        total_movement = 0
+        positions_history = array('i', [current_position])
+        next_arrival = 0
+        
+        def admit(request_id):
+            request = requests[request_id]
+            if request > current_position or (request == current_position and direction > 0):
+                heapq.heappush(up, (request, request_id))
+            else:
+                heapq.heappush(down, (-request, request_id))
+        
+        while next_arrival < min(window, n):
+            admit(next_arrival)
+            next_arrival += 1
+        
+        while up or down:
+            if direction > 0 and not up:
+                direction = -1
+            elif direction < 0 and not down:
+                direction = 1
+            
+            if direction > 0:
+                request, _ = heapq.heappop(up)
+            else:
+                request, _ = heapq.heappop(down)
+                request = -request
+            
+            movement = abs(current_position - request)
+            total_movement += movement
+            current_position = request
+            positions_history.append(current_position)
+            
+            if next_arrival < n:
+                admit(next_arrival)
+                next_arrival += 1
+        
+        return self._wrap_history('ANTICIPATORY', positions_history, total_movement)
+    
+    def _arrival_list_and_order(self, sort=True):
+        """
+        Solicitudes como lista de Python (orden de llegada) y, si se pide, los índices
+        que las ordenan por cilindro (estable: a igual cilindro, primero la más vieja),
+        sacados del índice compartido sin volver a ordenar
+        """
+        if self.engine == 'numpy':
+            requests = self._requests_array().tolist()
+        else:
+            requests = list(self.requests)
+        order = self.workload_index.arrival_order(requests) if sort else None
+        return requests, order
+    
+    def _wrap_history(self, algorithm, positions_history, total_movement):
+        """Empaqueta un historial array('i'); con el motor NumPy lo expone como int32 sin copiar"""
+        if self.engine == 'numpy':
+            import numpy as np
+            positions_history = np.frombuffer(positions_history, dtype=np.int32)
+        return ScheduleResult(algorithm, positions_history, total_movement)
+    
+    # ------------------------------------------------------------------
+    # Motor NumPy: en vez de recorrer solicitud por solicitud, armamos el
+    # orden de servicio completo como un arreglo int32 y calculamos el
+    # movimiento total con np.abs(np.diff(...)).sum()
+    # ------------------------------------------------------------------
+    
+    def _requests_array(self):
+        """Devuelve las solicitudes como arreglo int32 (sin copiar si ya lo son)"""
+        import numpy as np
+        return np.asarray(self.requests, dtype=np.int32)
+    
+    def _finish_numpy(self, algorithm, service_order):
+        """
+        Antepone la posición inicial al orden de servicio y calcula el movimiento total
+        
+        Retorna:
+            Un ScheduleResult cuyo historial es un arreglo int32
+        """
+        import numpy as np
+        positions_history = np.empty(len(service_order) + 1, dtype=np.int32)
+        positions_history[0] = self.initial_position
+        positions_history[1:] = service_order
+        # Las posiciones son no negativas, así que la diferencia cabe en int32;
+        # la suma sí la acumulamos en int64 para no desbordar con muchos pasos
+        total_movement = int(np.abs(np.diff(positions_history)).sum(dtype=np.int64))
+        return ScheduleResult(algorithm, positions_history, total_movement)
+    
+    def _fcfs_numpy(self):
+        """Versión vectorizada de FCFS: el orden de servicio es el orden de llegada"""
+        return self._finish_numpy('FCFS', self._requests_array())
+    
+    def _split_sorted_numpy(self):
+        """Devuelve las vistas (izquierda, derecha) de la posición inicial desde el índice compartido"""
+        index = self.workload_index
+        return index.left(), index.right()
+    
+    def _scan_numpy(self):
+        """Versión vectorizada de SCAN: derecha, final del disco e izquierda descendente"""
+        import numpy as np
+        left_requests, right_requests = self._split_sorted_numpy()
+        last_cylinder = self.num_cylinders - 1
+        
+        parts = [right_requests]
+        current_position = right_requests[-1] if len(right_requests) else self.initial_position
+        if len(left_requests):
+            if current_position != last_cylinder:
+                parts.append(np.array([last_cylinder], dtype=np.int32))
+            parts.append(left_requests[::-1])
+        
+        return self._finish_numpy('SCAN', np.concatenate(parts))
+    
+    def _c_scan_numpy(self):
+        """Versión vectorizada de C-SCAN: derecha, final del disco, salto a 0 e izquierda"""
+        import numpy as np
+        left_requests, right_requests = self._split_sorted_numpy()
+        last_cylinder = self.num_cylinders - 1
+        
+        parts = [right_requests]
+        current_position = right_requests[-1] if len(right_requests) else self.initial_position
+        if current_position != last_cylinder:
+            parts.append(np.array([last_cylinder], dtype=np.int32))
+        if len(left_requests):
+            parts.append(np.array([0], dtype=np.int32))
+            parts.append(left_requests)
+        
+        return self._finish_numpy('C-SCAN', np.concatenate(parts))
+    
+    def _sstf_numpy(self):
+        """
+        SSTF con el motor NumPy: el orden se elige con los dos punteros (es inherentemente
+        secuencial), pero el ordenamiento y el cálculo del total son vectorizados
+        """
+        import numpy as np
+        index = self.workload_index
+        service_order = np.fromiter(
+            _iter_sstf_order(index.sorted_requests.tolist(), index.split, self.initial_position),
+            dtype=np.int32, count=len(index.sorted_requests))
+        return self._finish_numpy('SSTF', service_order)
+    
+    def _look_numpy(self):
+        """Versión vectorizada de LOOK: derecha ascendente y luego izquierda descendente"""
+        import numpy as np
+        left_requests, right_requests = self._split_sorted_numpy()
+        return self._finish_numpy('LOOK', np.concatenate((right_requests, left_requests[::-1])))
+    
+    def _c_look_numpy(self):
+        """Versión vectorizada de C-LOOK: derecha ascendente y luego izquierda ascendente"""
+        import numpy as np
+        left_requests, right_requests = self._split_sorted_numpy()
+        return self._finish_numpy('C-LOOK', np.concatenate((right_requests, left_requests)))
+    
+    def run(self, algorithm):
+        """
+        Ejecuta un algoritmo por su nombre (ver ALGORITHMS), pasando por la caché si hay
+        
+        Retorna:
+            El ScheduleResult del algoritmo; si vino de la caché, su historial es de solo lectura
+        """
+        if self.cache is None:
+            return getattr(self, ALGORITHMS[algorithm])()
+        
+        key = self.cache.key(self, algorithm)
+        result = self.cache.get(key)
+        if result is not None:
+            self.instrumentation.count('cache_hits')
+        else:
+            result = getattr(self, ALGORITHMS[algorithm])()
+            self.cache.put(key, result)
+        return result
     
     def run_all_algorithms(self):
         """
-        Ejecuta los tres algoritmos y nos da los resultados de todos
+        Ejecuta todos los algoritmos y nos da los resultados de todos
         
         Retorna:
             Un diccionario con los resultados de cada algoritmo
         """
-        results = {
-            'FCFS': self.fcfs(),
-            'SCAN': self.scan(),
-            'C-SCAN': self.c_scan()
-        }
+        results = {name: self.run(name) for name in ALGORITHMS}
         return results
+    
+    def totals(self, algorithms=None):
+        """
+        Calcula solo el movimiento total de cada algoritmo, sin armar historiales
+        
+        FCFS es una sola pasada sumando distancias. SCAN, LOOK, C-SCAN y C-LOOK tienen
+        fórmula cerrada: solo dependen del mínimo, el máximo, la mayor solicitud a la
+        izquierda del cabezal, la posición inicial y el número de cilindros, así que no
+        hace falta ordenar. SSTF necesita el índice ordenado (con el motor 'numpy' recorre
+        solo los cilindros distintos), y DEADLINE y ANTICIPATORY dependen del reloj, así
+        que esos se ejecutan completos y solo se toma el total.
+        Si ya existe self.workload (por add/cancel_requests), las cuatro fórmulas salen
+        de sus conteos en O(log N).
+        
+        Parámetros:
+            algorithms: Nombres de los algoritmos a calcular (por defecto DEFAULT_ALGORITHMS)
+        
+        Retorna:
+            Un diccionario {algoritmo: movimiento_total}
+        """
+        if algorithms is None:
+            algorithms = list(DEFAULT_ALGORITHMS)
+        
+        closed_form = [name for name in algorithms if name in StreamingTotals.CLOSED_FORM]
+        totals = {}
+        if self._workload is not None:
+            totals = self.workload.totals([name for name in closed_form if name in self._workload.CLOSED_FORM])
+            closed_form = [name for name in closed_form if name not in totals]
+        if closed_form:
+            stream = StreamingTotals(self.initial_position, self.num_cylinders)
+            stream.feed_chunks(self.requests)
+            totals.update(stream.totals(closed_form))
+        
+        if 'SSTF' in algorithms:
+            index = self.workload_index
+            if self.engine == 'numpy':
+                # Las repetidas de un cilindro se atienden seguidas y sin moverse (distancia
+                # 0), así que el total es el mismo recorriendo solo los cilindros distintos:
+                # a lo sumo num_cylinders pasos de Python, como enteros de Python
+                import numpy as np
+                distinct = index.sorted_requests[_first_of_runs(index.sorted_requests)]
+                split = int(np.searchsorted(distinct, self.initial_position, side='left'))
+                service_order = np.fromiter(
+                    _iter_sstf_order(distinct.tolist(), split, self.initial_position),
+                    dtype=np.int64, count=len(distinct))
+                steps = np.diff(service_order, prepend=np.int64(self.initial_position))
+                totals['SSTF'] = int(np.abs(steps).sum())
+            else:
+                current_position = self.initial_position
+                total_movement = 0
+                for request in _iter_sstf_order(index.sorted_requests, index.split, self.initial_position):
+                    total_movement += abs(current_position - request)
+                    current_position = request
+                totals['SSTF'] = int(total_movement)
+        
+        for name in algorithms:
+            if name not in totals:
+                totals[name] = getattr(self, ALGORITHMS[name])().total_movement
+        
+        return {name: totals[name] for name in algorithms}
+
+
+class ScheduleResult:
+    """
+    Resultado compacto de un algoritmo
+    
+    En vez de una lista de enteros de Python (unos 36 bytes por posición), el historial
+    se guarda en un buffer de enteros de 32 bits: array('i') con el motor 'python' o un
+    arreglo np.int32 con el motor 'numpy' (4 bytes por posición).
+    
+    El historial incluye la posición inicial en el índice 0, igual que antes. Cortar un
+    resultado (result[a:b]) o convertirlo con np.asarray() no copia nada, y también
+    expone el protocolo de buffer a través de memoryview(result.buffer).
+    """
+    
+    __slots__ = ('algorithm', 'positions', '_total_movement')
+    
+    def __init__(self, algorithm, positions, total_movement=None):
+        """
+        Parámetros:
+            algorithm: Nombre del algoritmo (por ejemplo 'SCAN')
+            positions: Historial de posiciones como array('i') o arreglo int32
+            total_movement: Movimiento total si ya se conoce; si no, se calcula al pedirlo
+        """
+        self.algorithm = algorithm
+        self.positions = positions
+        self._total_movement = None if total_movement is None else int(total_movement)
+    
+    @property
+    def total_movement(self):
+        """Cilindros recorridos en total"""
+        if self._total_movement is None:
+            self._total_movement = int(self.seek_distances.sum(dtype='int64'))
+        return self._total_movement
+    
+    @property
+    def service_order(self):
+        """Las solicitudes en el orden en que se atendieron (vista, sin la posición inicial)"""
+        return self[1:]
+    
+    @property
+    def seek_distances(self):
+        """Cuántos cilindros se movió el cabezal en cada paso (arreglo int32)"""
+        import numpy as np
+        return np.abs(np.diff(self.__array__()))
+    
+    def service_ms(self, cost_model=None):
+        """
+        Tiempo (ms) de cada paso según un modelo de cost_models
+        
+        Sin modelo se usa LinearCostModel (MS_PER_CYLINDER por cilindro).
+        """
+        return self._cost_model(cost_model).step_ms(self)
+    
+    def total_service_ms(self, cost_model=None):
+        """Tiempo total de servicio en ms (ver service_ms)"""
+        return self._cost_model(cost_model).total_ms(self)
+    
+    def average_service_ms(self, num_requests, cost_model=None):
+        """
+        Tiempo promedio por solicitud en ms (ver service_ms)
+        
+        num_requests va aparte porque el historial de SCAN y C-SCAN incluye las visitas a
+        los extremos del disco, que no son solicitudes.
+        """
+        return self._cost_model(cost_model).average_ms(self, num_requests)
+    
+    def _cost_model(self, cost_model):
+        if cost_model is not None:
+            return cost_model
+        from cost_models import LinearCostModel
+        # El modelo lineal no arma tabla: no hace falta saber hasta qué distancia cubrir
+        return LinearCostModel()
+    
+    @property
+    def buffer(self):
+        """memoryview del historial, para consumidores del protocolo de buffer"""
+        return memoryview(self.positions)
+    
+    @property
+    def nbytes(self):
+        """Bytes que ocupa el historial"""
+        return self.buffer.nbytes
+    
+    def __array__(self, dtype=None, copy=None):
+        # np.frombuffer envuelve el array('i') sin copiarlo
+        import numpy as np
+        positions = self.positions
+        if not isinstance(positions, np.ndarray):
+            positions = np.frombuffer(positions, dtype=np.int32)
+        if dtype is not None and positions.dtype != dtype:
+            return positions.astype(dtype)
+        return positions
+    
+    def __buffer__(self, flags):
+        # Protocolo de buffer nativo desde Python 3.12: memoryview(result)
+        return memoryview(self.positions)
+    
+    def __len__(self):
+        return len(self.positions)
+    
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return self.__array__()[key]
+        return int(self.positions[key])
+    
+    def __iter__(self):
+        return iter(self.positions)
+    
+    def __repr__(self):
+        return (f"ScheduleResult(algorithm={self.algorithm!r}, total_movement={self.total_movement}, "
+                f"steps={len(self) - 1})")
 
 
-def print_results(scheduler, results):
-    """Imprime los resultados de forma bonita para que sea fácil comparar"""
+class WorkloadIndex:
+    """
+    Precómputo compartido de una carga de solicitudes
+    
+    Guarda las solicitudes ordenadas una sola vez, el punto de corte (con bisect)
+    respecto a la posición inicial y, cuando alguien lo pide, el histograma de
+    solicitudes por cilindro. Así SCAN, C-SCAN, SSTF, LOOK y C-LOOK no vuelven a
+    ordenar ni a partir la misma lista cada uno por su cuenta.
+    
+    Con el motor 'python' todo son listas de Python; con el motor 'numpy' son
+    arreglos int32 y left()/right() devuelven vistas sin copiar.
+    """
+    
+    def __init__(self, requests, initial_position, num_cylinders, engine='python'):
+        self.initial_position = initial_position
+        self.num_cylinders = num_cylinders
+        self.engine = engine
+        
+        if engine == 'numpy':
+            import numpy as np
+            self.sorted_requests = np.sort(np.asarray(requests, dtype=np.int32))
+            self.split = int(np.searchsorted(self.sorted_requests, initial_position, side='left'))
+        else:
+            self.sorted_requests = sorted(requests)
+            self.split = bisect.bisect_left(self.sorted_requests, initial_position)
+        
+        self.num_left = self.split
+        self.num_right = len(self.sorted_requests) - self.split
+        self._histogram = None
+        self._arrival_order = None
+    
+    @classmethod
+    def from_sorted(cls, sorted_requests, initial_position, num_cylinders, engine='python'):
+        """Arma el índice con solicitudes que ya vienen ordenadas (no las vuelve a ordenar)"""
+        index = cls.__new__(cls)
+        index.initial_position = initial_position
+        index.num_cylinders = num_cylinders
+        index.engine = engine
+        index.sorted_requests = sorted_requests
+        if engine == 'numpy':
+            import numpy as np
+            index.split = int(np.searchsorted(sorted_requests, initial_position, side='left'))
+        else:
+            index.split = bisect.bisect_left(sorted_requests, initial_position)
+        index.num_left = index.split
+        index.num_right = len(sorted_requests) - index.split
+        index._histogram = None
+        index._arrival_order = None
+        return index
+    
+    def matches(self, scheduler):
+        """Indica si el índice sigue sirviendo para la configuración actual del planificador"""
+        return (self.engine == scheduler.engine and
+                self.initial_position == scheduler.initial_position and
+                self.num_cylinders == scheduler.num_cylinders)
+    
+    def left(self):
+        """Solicitudes a la izquierda de la posición inicial, de menor a mayor"""
+        if self.engine == 'numpy':
+            return self.sorted_requests[:self.split]
+        return itertools.islice(self.sorted_requests, 0, self.split)
+    
+    def left_descending(self):
+        """Solicitudes a la izquierda de la posición inicial, de mayor a menor"""
+        if self.engine == 'numpy':
+            return self.sorted_requests[:self.split][::-1]
+        sorted_requests = self.sorted_requests
+        return (sorted_requests[i] for i in range(self.split - 1, -1, -1))
+    
+    def right(self):
+        """Solicitudes en o a la derecha de la posición inicial, de menor a mayor"""
+        if self.engine == 'numpy':
+            return self.sorted_requests[self.split:]
+        return itertools.islice(self.sorted_requests, self.split, None)
+    
+    @property
+    def histogram(self):
+        """Cuántas solicitudes hay en cada cilindro (se calcula la primera vez que se pide)"""
+        if self._histogram is None:
+            if self.engine == 'numpy':
+                import numpy as np
+                self._histogram = np.bincount(self.sorted_requests, minlength=self.num_cylinders)
+            else:
+                counts = [0] * self.num_cylinders
+                for request in self.sorted_requests:
+                    counts[request] += 1
+                self._histogram = counts
+        return self._histogram
+    
+    def arrival_order(self, requests):
+        """
+        Permutación estable de llegada: arrival_order(requests)[k] es el índice de llegada
+        de sorted_requests[k] (a igual cilindro, primero la más vieja)
+        
+        requests son las solicitudes de este índice en orden de llegada. No se vuelve a
+        ordenar: cada solicitud ocupa el primer lugar libre de su cilindro dentro de
+        sorted_requests, en una pasada. Se calcula la primera vez que se pide y devuelve
+        una lista de Python.
+        """
+        if self._arrival_order is None:
+            if self.engine == 'numpy':
+                import numpy as np
+                starts = np.flatnonzero(_first_of_runs(self.sorted_requests))
+                next_slot = dict(zip(self.sorted_requests[starts].tolist(), starts.tolist()))
+            else:
+                next_slot = {}
+                for position, request in enumerate(self.sorted_requests):
+                    next_slot.setdefault(request, position)
+            
+            order = [0] * len(self.sorted_requests)
+            for request_id, request in enumerate(requests):
+                slot = next_slot[request]
+                order[slot] = request_id
+                next_slot[request] = slot + 1
+            self._arrival_order = order
+        return self._arrival_order
+
+
+def _first_of_runs(sorted_requests):
+    """Máscara de NumPy que marca la primera aparición de cada cilindro en un arreglo ordenado"""
+    import numpy as np
+    first = np.ones(len(sorted_requests), dtype=bool)
+    np.not_equal(sorted_requests[1:], sorted_requests[:-1], out=first[1:])
+    return first
+
+
+def _iter_sstf_order(sorted_requests, split, initial_position):
+    """
+    Genera el orden de servicio de SSTF sobre una lista ya ordenada
+    
+    Parámetros:
+        sorted_requests: Lista de solicitudes ordenada de menor a mayor
+        split: Índice de la primera solicitud >= initial_position
+        initial_position: Dónde empieza el cabezal
+    
+    Produce:
+        Las solicitudes una por una, en el orden en que se atienden
+    """
+    current_position = initial_position
+    left = split - 1  # Vecino pendiente más cercano por la izquierda
+    right = split     # Vecino pendiente más cercano por la derecha
+    n = len(sorted_requests)
+    
+    while left >= 0 or right < n:
+        if right < n and (left < 0 or
+                          sorted_requests[right] - current_position <= current_position - sorted_requests[left]):
+            current_position = sorted_requests[right]
+            right += 1
+        else:
+            current_position = sorted_requests[left]
+            left -= 1
+        yield current_position
+
+
+def optimal_movement(initial_position, minimum, maximum):
+    """
+    Cota inferior exacta (offline) del movimiento para visitar todas las solicitudes
+    
+    Con un solo cabezal sobre una línea, lo mejor es ir primero al extremo más cercano
+    y después barrer hasta el otro: (alto - bajo) + min(inicio - bajo, alto - inicio),
+    donde bajo y alto incluyen la posición inicial. Solo hacen falta el mínimo y el
+    máximo de la carga, así que se calcula en O(n) sin ordenar.
+    
+    Parámetros:
+        minimum, maximum: Menor y mayor solicitud (None si no hay solicitudes)
+    """
+    if minimum is None:
+        return 0
+    low = min(minimum, initial_position)
+    high = max(maximum, initial_position)
+    return int((high - low) + min(initial_position - low, high - initial_position))
+
+
+def overhead_percent(total_movement, optimal_total):
+    """Cuánto más que la cota óptima se movió un algoritmo, en % (None si la cota es 0)"""
+    if optimal_total == 0:
+        return 0.0 if total_movement == 0 else None
+    return 100.0 * (total_movement - optimal_total) / optimal_total
+
+
+class StreamingTotals:
+    """
+    Movimiento total de cada algoritmo calculado en una sola pasada, sin ordenar
+    
+    Las solicitudes se pueden ir entregando por partes con feed() (listas o arreglos
+    de NumPy, por ejemplo trozos de un archivo enorme) y solo se guardan unos pocos
+    números: cuántas hay, el mínimo, el máximo, la mayor a la izquierda del cabezal
+    y el total acumulado de FCFS. Con eso alcanzan las fórmulas cerradas.
+    """
+    
+    # Algoritmos que se pueden calcular solo con las estadísticas acumuladas
+    CLOSED_FORM = ('FCFS', 'SCAN', 'LOOK', 'C-SCAN', 'C-LOOK')
+    
+    def __init__(self, initial_position, num_cylinders):
+        self.initial_position = initial_position
+        self.num_cylinders = num_cylinders
+        
+        self.count = 0
+        self.num_left = 0       # Solicitudes estrictamente a la izquierda del cabezal
+        self.minimum = None
+        self.maximum = None
+        self.max_left = None    # La mayor solicitud a la izquierda del cabezal
+        self.fcfs_total = 0
+        self._last_position = initial_position
+    
+    @property
+    def num_right(self):
+        """Solicitudes en o a la derecha del cabezal"""
+        return self.count - self.num_left
+    
+    def feed(self, requests):
+        """Agrega un trozo de solicitudes (en orden de llegada) a las estadísticas"""
+        if hasattr(requests, 'dtype'):
+            self._feed_numpy(requests)
+            return
+        
+        initial_position = self.initial_position
+        last_position = self._last_position
+        for request in requests:
+            self.fcfs_total += abs(last_position - request)
+            last_position = request
+            
+            if self.minimum is None or request < self.minimum:
+                self.minimum = request
+            if self.maximum is None or request > self.maximum:
+                self.maximum = request
+            if request < initial_position:
+                self.num_left += 1
+                if self.max_left is None or request > self.max_left:
+                    self.max_left = request
+            self.count += 1
+        self._last_position = last_position
+    
+    def feed_chunks(self, requests, chunk_size=STREAM_CHUNK_SIZE):
+        """Entrega todas las solicitudes con feed() en trozos de chunk_size (vistas si es un arreglo)"""
+        for start in range(0, len(requests), chunk_size):
+            self.feed(requests[start:start + chunk_size])
+    
+    def _feed_numpy(self, requests):
+        """Versión vectorizada de feed() para arreglos de NumPy"""
+        import numpy as np
+        if len(requests) == 0:
+            return
+        
+        # En int64: con tipos chicos o sin signo (uint16, por ejemplo) la resta daría la vuelta
+        steps = np.diff(requests.astype(np.int64, copy=False), prepend=np.int64(self._last_position))
+        self.fcfs_total += int(np.abs(steps).sum(dtype=np.int64))
+        self._last_position = int(requests[-1])
+        
+        chunk_min = int(requests.min())
+        chunk_max = int(requests.max())
+        self.minimum = chunk_min if self.minimum is None else min(self.minimum, chunk_min)
+        self.maximum = chunk_max if self.maximum is None else max(self.maximum, chunk_max)
+        
+        left_requests = requests[requests < self.initial_position]
+        if len(left_requests):
+            chunk_max_left = int(left_requests.max())
+            self.max_left = chunk_max_left if self.max_left is None else max(self.max_left, chunk_max_left)
+            self.num_left += len(left_requests)
+        self.count += len(requests)
+    
+    def totals(self, algorithms=None):
+        """
+        Aplica las fórmulas cerradas con lo acumulado hasta ahora
+        
+        Retorna:
+            Un diccionario {algoritmo: movimiento_total}
+        """
+        if algorithms is None:
+            algorithms = self.CLOSED_FORM
+        
+        start = self.initial_position
+        last_cylinder = self.num_cylinders - 1
+        has_left = self.num_left > 0
+        has_right = self.num_right > 0
+        # Hasta dónde llega el cabezal después de atender todo lo de la derecha
+        top = self.maximum if has_right else start
+        
+        formulas = {
+            'FCFS': lambda: self.fcfs_total,
+            # Sube hasta el final del disco solo si tiene que volver por la izquierda
+            'SCAN': lambda: ((last_cylinder - start) + (last_cylinder - self.minimum)
+                             if has_left else top - start),
+            'LOOK': lambda: (top - start) + (top - self.minimum if has_left else 0),
+            # Siempre llega al final; si hay izquierda salta a 0 y sube hasta max_left
+            'C-SCAN': lambda: (last_cylinder - start) + (last_cylinder + self.max_left if has_left else 0),
+            'C-LOOK': lambda: (top - start) + ((top - self.minimum) + (self.max_left - self.minimum)
+                                               if has_left else 0),
+        }
+        
+        totals = {}
+        for name in algorithms:
+            if name not in formulas:
+                raise ValueError(f"{name} no tiene fórmula cerrada. Opciones: {', '.join(self.CLOSED_FORM)}")
+            totals[name] = int(formulas[name]())
+        return totals
+
+
+def print_results(scheduler, results, cost_model=None):
+    """
+    Imprime los resultados de forma bonita para que sea fácil comparar
+    
+    cost_model es un modelo de cost_models para convertir los movimientos en tiempo;
+    por defecto el lineal de MS_PER_CYLINDER ms por cilindro.
+    """
+    if cost_model is None:
+        from cost_models import LinearCostModel
+        cost_model = LinearCostModel(scheduler.num_cylinders)
+    optimal_total = scheduler.optimal_total
+    
     print("=" * 60)
     print("COMPARACIÓN DE ALGORITMOS DE PLANIFICACIÓN DE DISCO")
     print("=" * 60)
     print(f"Número de cilindros: {scheduler.num_cylinders}")
     print(f"Número de solicitudes: {scheduler.num_requests}")
     print(f"Posición inicial del cabezal: {scheduler.initial_position}")
+    print(f"Cota óptima (offline): {optimal_total} cilindros")
     print("=" * 60)
     
-    for algorithm, (total_movement, _) in results.items():
+    for algorithm, result in results.items():
         print(f"\n{algorithm}:")
-        print(f"  Movimiento total del cabezal: {total_movement} cilindros")
+        print(f"  Movimiento total del cabezal: {result.total_movement} cilindros")
+        total_ms = result.total_service_ms(cost_model)
+        average_ms = result.average_service_ms(scheduler.num_requests, cost_model)
+        print(f"  Tiempo de servicio: {total_ms:.1f} ms ({average_ms:.2f} ms por solicitud)")
+        overhead = overhead_percent(result.total_movement, optimal_total)
+        overhead_text = "sin cota (el óptimo no se mueve)" if overhead is None else f"+{overhead:.2f}%"
+        print(f"  Sobrecosto respecto al óptimo: {overhead_text}")
     
     print("\n" + "=" * 60)
     print("RESUMEN:")
-    movements = {alg: result[0] for alg, result in results.items()}
+    movements = {alg: result.total_movement for alg, result in results.items()}
     best_algorithm = min(movements, key=movements.get)
     worst_algorithm = max(movements, key=movements.get)
     
@@ -180,31 +1257,118 @@ def print_results(scheduler, results):
     print("=" * 60)
 
 
-def main():
+def parse_args(argv=None):
+    """Lee los parámetros de la línea de comandos (los valores por defecto son los del enunciado)"""
+    parser = argparse.ArgumentParser(description="Compara algoritmos de planificación de disco")
+    parser.add_argument('--cylinders', type=int, default=5000, help="Número de cilindros del disco")
+    parser.add_argument('--requests', type=int, default=1000, help="Número de solicitudes aleatorias")
+    parser.add_argument('--head', type=int, default=2500, help="Posición inicial del cabezal")
+    parser.add_argument('--algorithms', nargs='+', choices=list(ALGORITHMS),
+                        help="Algoritmos a ejecutar (por defecto todos; con --totals-only, DEFAULT_ALGORITHMS)")
+    parser.add_argument('--seed', type=int, help="Semilla para que la carga sea reproducible")
+    parser.add_argument('--engine', choices=ENGINES, default='python', help="Motor de ejecución")
+    parser.add_argument('--totals-only', action='store_true',
+                        help="Calcular solo los movimientos totales, sin historiales")
+    parser.add_argument('--format', choices=('text', 'json', 'csv'), default='text', help="Formato de salida")
+    parser.add_argument('--cost-model', choices=('linear', 'acceleration'), default='linear',
+                        help="Cómo convertir movimientos en tiempo (ver cost_models.py)")
+    parser.add_argument('--export', metavar='DIR',
+                        help="Exportar los historiales por columnas en DIR (ver export.py)")
+    parser.add_argument('--instrument', action='store_true',
+                        help="Medir fases y contadores; el reporte JSON va junto a las gráficas o a stderr")
+    parser.add_argument('--plots', metavar='DIR', help="Guardar las gráficas en DIR (sin abrir ventanas)")
+    parser.add_argument('--plot-workers', type=int, metavar='N',
+                        help="Procesos para dibujar las gráficas (por defecto uno por gráfica, hasta el número de núcleos)")
+    parser.add_argument('--cache', metavar='DIR', nargs='?', const='.disk_scheduling_cache',
+                        help="Reutilizar resultados guardados en DIR (por defecto .disk_scheduling_cache)")
+    args = parser.parse_args(argv)
+    
+    if not 0 <= args.head < args.cylinders:
+        parser.error(f"--head debe estar entre 0 y {args.cylinders - 1}")
+    if args.plots and args.totals_only:
+        parser.error("--plots necesita los historiales; no se puede combinar con --totals-only")
+    if args.export and args.totals_only:
+        parser.error("--export necesita los historiales; no se puede combinar con --totals-only")
+    if args.plot_workers is not None and args.plot_workers < 1:
+        parser.error("--plot-workers debe ser al menos 1")
+    if args.algorithms is None:
+        args.algorithms = list(DEFAULT_ALGORITHMS if args.totals_only else ALGORITHMS)
+    return args
+
+
+def print_totals(scheduler, totals, output_format):
+    """Imprime {algoritmo: movimiento_total} en JSON o CSV para que otros programas lo lean"""
+    if output_format == 'json':
+        print(json.dumps({
+            'num_cylinders': scheduler.num_cylinders,
+            'num_requests': scheduler.num_requests,
+            'initial_position': scheduler.initial_position,
+            'optimal_total': scheduler.optimal_total,
+            'total_movement': totals,
+        }, indent=2))
+    else:
+        print("algorithm,total_movement")
+        for algorithm, total_movement in totals.items():
+            print(f"{algorithm},{total_movement}")
+
+
+def main(argv=None):
     """Función principal que ejecuta todo el programa"""
-    # Aquí definimos los parámetros del disco
-    NUM_CYLINDERS = 5000
-    NUM_REQUESTS = 1000
-    INITIAL_POSITION = 2500  # Empezamos en la mitad del disco
+    args = parse_args(argv)
+    text_output = args.format == 'text'
     
-    print("\nGenerando escenario de planificación de disco...")
-    print(f"Cilindros del disco: 0 - {NUM_CYLINDERS - 1}")
-    print(f"Número de solicitudes: {NUM_REQUESTS}")
-    print(f"Posición inicial del cabezal: {INITIAL_POSITION}")
-    print("\nProcesando algoritmos...\n")
+    if text_output:
+        print("\nGenerando escenario de planificación de disco...")
+        print(f"Cilindros del disco: 0 - {args.cylinders - 1}")
+        print(f"Número de solicitudes: {args.requests}")
+        print(f"Posición inicial del cabezal: {args.head}")
+        print("\nProcesando algoritmos...\n")
+    
+    # Con semilla, el motor NumPy usa su propio generador; el de Python, el módulo random
+    rng = None
+    if args.seed is not None:
+        if args.engine == 'numpy':
+            import numpy as np
+            rng = np.random.default_rng(args.seed)
+        else:
+            random.seed(args.seed)
+    
+    cache = None
+    if args.cache:
+        from result_cache import ResultCache
+        cache = ResultCache(args.cache)
+    
+    instrumentation = None
+    if args.instrument:
+        from instrumentation import Instrumentation
+        instrumentation = Instrumentation()
     
     # Creamos nuestro planificador y ejecutamos los algoritmos
-    scheduler = DiskScheduler(NUM_CYLINDERS, NUM_REQUESTS, INITIAL_POSITION)
-    results = scheduler.run_all_algorithms()
+    scheduler = DiskScheduler(args.cylinders, args.requests, args.head, engine=args.engine, rng=rng,
+                              cache=cache, instrumentation=instrumentation)
+    if args.totals_only:
+        results = scheduler.totals(args.algorithms)
+    else:
+        results = {name: scheduler.run(name) for name in args.algorithms}
     
     # Mostramos los resultados
-    print_results(scheduler, results)
+    if text_output and not args.totals_only:
+        from cost_models import get_cost_model
+        print_results(scheduler, results, get_cost_model(args.cost_model, args.cylinders))
+    else:
+        totals = results if args.totals_only else {name: result.total_movement for name, result in results.items()}
+        print_totals(scheduler, totals, 'csv' if text_output else args.format)
+    
+    if args.export:
+        from export import export_results
+        export_results(results, args.export, args.head)
     
-    # Preparamos los datos por si queremos hacer gráficas después
-    visualization_data = {
-        'scheduler': scheduler,
-        'results': results
-    }
+    # Las gráficas (y matplotlib) solo se cargan si se piden
+    if args.plots:
+        from visualizations import save_all_plots
+        save_all_plots(scheduler, results, args.plots, workers=args.plot_workers, headless=True)
+    elif instrumentation is not None:
+        print(json.dumps(instrumentation.report(), indent=2), file=sys.stderr)
     
     return scheduler, results
 
@@ -0,0 +1,213 @@
+"""
+Exportación por columnas de los historiales, por trozos y con acceso aleatorio
+Cada algoritmo se guarda en una carpeta con tres columnas (posición atendida, distancia
+de cada paso y movimiento acumulado) partidas en archivos .npy de chunk_steps pasos, más
+un index.json con los límites de cada trozo. Escribir usa memoria acotada por el tamaño
+del trozo aunque la corrida tenga miles de millones de pasos, y leer un rango de pasos
+abre solo los trozos que lo tocan, con memoria mapeada
+"""
+
+import bisect
+import json
+import os
+
+import numpy as np
+
+
+INDEX_NAME = 'index.json'
+DEFAULT_CHUNK_STEPS = 1 << 22  # unos 4 millones de pasos (64 MiB entre las tres columnas)
+
+# Columnas que se escriben y su tipo
+COLUMNS = {
+    'position': np.int32,    # Cilindro atendido en el paso
+    'seek': np.int32,        # Cilindros recorridos para llegar ahí
+    'cumulative': np.int64,  # Movimiento total hasta ese paso, inclusive
+}
+
+
+def _chunk_path(directory, algorithm, column, number):
+    return os.path.join(directory, algorithm, f'{column}.{number:06d}.npy')
+
+
+class ColumnWriter:
+    """
+    Escribe el historial de un algoritmo trozo a trozo
+
+    write() acepta posiciones en cualquier cantidad (listas, arreglos o vistas de un
+    ScheduleResult); las distancias y el acumulado siguen desde el último paso escrito.
+    """
+
+    def __init__(self, export, algorithm, initial_position):
+        self.export = export
+        self.algorithm = algorithm
+        self.initial_position = initial_position
+        self.chunks = []
+        self.num_steps = 0
+        self.total_movement = 0
+        self._last_position = initial_position
+        self._pending = []
+        self._pending_steps = 0
+        os.makedirs(os.path.join(export.directory, algorithm), exist_ok=True)
+
+    def write(self, positions):
+        """Agrega posiciones atendidas (en orden de servicio)"""
+        positions = np.asarray(positions, dtype=np.int32)
+        chunk_steps = self.export.chunk_steps
+        while len(positions):
+            # Completamos el trozo en curso y lo escribimos apenas se llena
+            room = chunk_steps - self._pending_steps
+            self._pending.append(positions[:room])
+            self._pending_steps += min(room, len(positions))
+            positions = positions[room:]
+            if self._pending_steps == chunk_steps:
+                self._flush()
+
+    def _flush(self):
+        if not self._pending_steps:
+            return
+        positions = np.concatenate(self._pending) if len(self._pending) > 1 else self._pending[0]
+        self._pending, self._pending_steps = [], 0
+
+        seek = np.abs(np.diff(positions, prepend=np.int32(self._last_position)))
+        cumulative = np.cumsum(seek, dtype=np.int64)
+        cumulative += self.total_movement
+
+        number = len(self.chunks)
+        for column, values in (('position', positions), ('seek', seek), ('cumulative', cumulative)):
+            np.save(_chunk_path(self.export.directory, self.algorithm, column, number),
+                    values.astype(COLUMNS[column], copy=False))
+
+        self.chunks.append([self.num_steps, self.num_steps + len(positions)])
+        self.num_steps += len(positions)
+        self.total_movement = int(cumulative[-1])
+        self._last_position = int(positions[-1])
+
+    def close(self):
+        """Escribe lo que quede pendiente y registra el algoritmo en el índice"""
+        self._flush()
+        self.export._register(self)
+
+
+class ScheduleExport:
+    """
+    Carpeta de exportación con varios algoritmos
+
+    Uso:
+        with ScheduleExport('runs/run1') as export:
+            export.write_result(result, initial_position=2500)
+            # o, para historiales que no caben en memoria:
+            writer = export.writer('SSTF', initial_position=2500)
+            for chunk in chunks:
+                writer.write(chunk)
+            writer.close()
+    """
+
+    def __init__(self, directory, chunk_steps=DEFAULT_CHUNK_STEPS):
+        self.directory = directory
+        self.chunk_steps = chunk_steps
+        self.algorithms = {}
+        os.makedirs(directory, exist_ok=True)
+
+    def writer(self, algorithm, initial_position):
+        return ColumnWriter(self, algorithm, initial_position)
+
+    def write_result(self, result, initial_position=None):
+        """
+        Exporta un ScheduleResult completo (por vistas de chunk_steps, sin copiarlo entero)
+
+        La posición inicial sale del índice 0 del historial si no se da.
+        """
+        positions = np.asarray(result)
+        if initial_position is None:
+            initial_position = int(positions[0]) if len(positions) else 0
+        writer = self.writer(result.algorithm, initial_position)
+        for start in range(1, len(positions), self.chunk_steps):
+            writer.write(positions[start:start + self.chunk_steps])
+        writer.close()
+
+    def _register(self, writer):
+        self.algorithms[writer.algorithm] = {
+            'initial_position': writer.initial_position,
+            'num_steps': writer.num_steps,
+            'total_movement': writer.total_movement,
+            'chunks': writer.chunks,
+        }
+        # El índice se reescribe por cada algoritmo terminado: una exportación a medias
+        # igual se puede leer
+        index = {
+            'chunk_steps': self.chunk_steps,
+            'columns': {column: np.dtype(dtype).name for column, dtype in COLUMNS.items()},
+            'algorithms': self.algorithms,
+        }
+        temporary_path = os.path.join(self.directory, INDEX_NAME + '.tmp')
+        with open(temporary_path, 'w') as index_file:
+            json.dump(index, index_file, indent=2)
+        os.replace(temporary_path, os.path.join(self.directory, INDEX_NAME))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+def export_results(results, directory, initial_position=None, chunk_steps=DEFAULT_CHUNK_STEPS):
+    """Exporta un diccionario {algoritmo: ScheduleResult} como el de run_all_algorithms()"""
+    export = ScheduleExport(directory, chunk_steps)
+    for result in results.values():
+        export.write_result(result, initial_position)
+    return export
+
+
+class ScheduleReader:
+    """Lee una exportación: cualquier rango de pasos, abriendo solo los trozos necesarios"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        with open(os.path.join(directory, INDEX_NAME)) as index_file:
+            self.index = json.load(index_file)
+        # Primer paso de cada trozo, para ubicar un paso con bisect
+        self._starts = {algorithm: [start for start, _ in info['chunks']]
+                        for algorithm, info in self.index['algorithms'].items()}
+
+    @property
+    def algorithms(self):
+        return list(self.index['algorithms'])
+
+    def num_steps(self, algorithm):
+        return self.index['algorithms'][algorithm]['num_steps']
+
+    def total_movement(self, algorithm):
+        return self.index['algorithms'][algorithm]['total_movement']
+
+    def read(self, algorithm, start=0, stop=None, columns=tuple(COLUMNS)):
+        """
+        Devuelve los pasos start .. stop - 1 de un algoritmo
+
+        Retorna:
+            Un diccionario {columna: arreglo}; si el rango cae en un solo trozo es una
+            vista de solo lectura del archivo mapeado, si no una copia de ese rango
+        """
+        info = self.index['algorithms'][algorithm]
+        num_steps = info['num_steps']
+        stop = num_steps if stop is None else min(stop, num_steps)
+        start = max(0, start)
+        if start >= stop:
+            return {column: np.empty(0, dtype=COLUMNS[column]) for column in columns}
+
+        first = bisect.bisect_right(self._starts[algorithm], start) - 1
+        last = bisect.bisect_right(self._starts[algorithm], stop - 1) - 1
+        parts = {column: [] for column in columns}
+        for number in range(first, last + 1):
+            chunk_start, chunk_stop = info['chunks'][number]
+            low, high = max(start, chunk_start) - chunk_start, min(stop, chunk_stop) - chunk_start
+            for column in columns:
+                values = np.load(_chunk_path(self.directory, algorithm, column, number), mmap_mode='r')
+                parts[column].append(values[low:high])
+        return {column: pieces[0] if len(pieces) == 1 else np.concatenate(pieces)
+                for column, pieces in parts.items()}
+
+    def iter_chunks(self, algorithm, columns=tuple(COLUMNS)):
+        """Recorre un algoritmo trozo por trozo (para procesarlo sin cargarlo entero)"""
+        for chunk_start, chunk_stop in self.index['algorithms'][algorithm]['chunks']:
+            yield chunk_start, self.read(algorithm, chunk_start, chunk_stop, columns)
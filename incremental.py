@@ -0,0 +1,270 @@
+"""
+Carga de solicitudes modificable sin volver a ordenar
+Un árbol de Fenwick sobre los cilindros guarda cuántas solicitudes hay en cada uno, así
+que agregar o cancelar k solicitudes cuesta O(k log N) y el mínimo, el máximo, la mayor
+a la izquierda del cabezal y la posición de un cilindro en el orden de servicio salen
+en O(log N), sin tocar el resto de la carga
+"""
+
+import itertools
+from collections import Counter
+
+from disk_scheduling import StreamingTotals
+
+
+class FenwickTree:
+    """
+    Árbol de Fenwick (binary indexed tree) de conteos por cilindro
+
+    Guarda sumas parciales en una lista de N + 1 posiciones: sumar en un cilindro,
+    contar cuántos hay antes de uno y buscar el k-ésimo cuestan O(log N).
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self._tree = [0] * (size + 1)
+        # La potencia de dos más grande que cabe, para la búsqueda binaria de find()
+        self._top_bit = 1 << (size.bit_length() - 1) if size else 0
+
+    @classmethod
+    def from_counts(cls, counts):
+        """Arma el árbol a partir de una lista de conteos en O(N)"""
+        fenwick = cls(len(counts))
+        tree = fenwick._tree
+        tree[1:] = counts
+        for i in range(1, fenwick.size + 1):
+            parent = i + (i & -i)
+            if parent <= fenwick.size:
+                tree[parent] += tree[i]
+        return fenwick
+
+    def add(self, index, delta):
+        """Suma delta al conteo del cilindro index"""
+        tree = self._tree
+        i = index + 1
+        while i <= self.size:
+            tree[i] += delta
+            i += i & -i
+
+    def prefix_sum(self, index):
+        """Cuántas solicitudes hay en los cilindros 0 .. index - 1"""
+        tree = self._tree
+        total = 0
+        i = index
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+    def find(self, k):
+        """Cilindro de la k-ésima solicitud en orden ascendente (k empieza en 1)"""
+        tree = self._tree
+        position = 0
+        bit = self._top_bit
+        while bit:
+            following = position + bit
+            if following <= self.size and tree[following] < k:
+                position = following
+                k -= tree[following]
+            bit >>= 1
+        return position
+
+
+class IncrementalWorkload:
+    """
+    Carga de solicitudes ordenada implícitamente por cilindro
+
+    Solo guarda conteos por cilindro (una lista y su árbol de Fenwick), así que el
+    orden de llegada no se conoce aquí: FCFS y los algoritmos que dependen del reloj
+    siguen necesitando la lista original.
+    """
+
+    # Algoritmos cuyo total y orden de servicio se mantienen de forma incremental
+    CLOSED_FORM = ('SCAN', 'LOOK', 'C-SCAN', 'C-LOOK')
+
+    def __init__(self, requests, initial_position, num_cylinders):
+        self.initial_position = initial_position
+        self.num_cylinders = num_cylinders
+
+        if hasattr(requests, 'dtype'):
+            import numpy as np
+            self.counts = np.bincount(requests, minlength=num_cylinders).tolist()
+        else:
+            self.counts = [0] * num_cylinders
+            for request in requests:
+                self.counts[request] += 1
+
+        self._tree = FenwickTree.from_counts(self.counts)
+        self.count = len(requests)
+        self.num_left = self._tree.prefix_sum(initial_position)
+
+    def _check_cylinders(self, cylinders):
+        for cylinder in cylinders:
+            if not 0 <= cylinder < self.num_cylinders:
+                raise ValueError(f"El cilindro {cylinder} no existe (0 - {self.num_cylinders - 1})")
+
+    def add(self, cylinders):
+        """Agrega solicitudes en O(k log N)"""
+        cylinders = [int(cylinder) for cylinder in cylinders]
+        self._check_cylinders(cylinders)
+        for cylinder in cylinders:
+            self._update(cylinder, 1)
+
+    def cancel(self, cylinders):
+        """
+        Cancela una solicitud pendiente por cada cilindro dado, en O(k log N)
+
+        Lanza ValueError (sin cambiar nada) si se cancelan más solicitudes de las
+        que hay pendientes en algún cilindro.
+        """
+        pending = Counter(int(cylinder) for cylinder in cylinders)
+        self._check_cylinders(pending)
+        for cylinder, amount in pending.items():
+            if self.counts[cylinder] < amount:
+                raise ValueError(f"No hay {amount} solicitudes pendientes en el cilindro {cylinder}")
+        for cylinder, amount in pending.items():
+            self._update(cylinder, -amount)
+
+    def _update(self, cylinder, delta):
+        self.counts[cylinder] += delta
+        self._tree.add(cylinder, delta)
+        self.count += delta
+        if cylinder < self.initial_position:
+            self.num_left += delta
+
+    @property
+    def num_right(self):
+        """Solicitudes en o a la derecha del cabezal"""
+        return self.count - self.num_left
+
+    @property
+    def minimum(self):
+        return self._tree.find(1) if self.count else None
+
+    @property
+    def maximum(self):
+        return self._tree.find(self.count) if self.count else None
+
+    @property
+    def max_left(self):
+        """La mayor solicitud a la izquierda del cabezal"""
+        return self._tree.find(self.num_left) if self.num_left else None
+
+    def totals(self, algorithms=None):
+        """
+        Movimiento total de SCAN, LOOK, C-SCAN y C-LOOK en O(log N)
+
+        Usa las mismas fórmulas cerradas que StreamingTotals con las estadísticas
+        que salen del árbol.
+
+        Retorna:
+            Un diccionario {algoritmo: movimiento_total}
+        """
+        if algorithms is None:
+            algorithms = self.CLOSED_FORM
+        for name in algorithms:
+            if name not in self.CLOSED_FORM:
+                raise ValueError(f"{name} no se mantiene de forma incremental. "
+                                 f"Opciones: {', '.join(self.CLOSED_FORM)}")
+
+        stream = StreamingTotals(self.initial_position, self.num_cylinders)
+        stream.count = self.count
+        stream.num_left = self.num_left
+        stream.minimum = self.minimum
+        stream.maximum = self.maximum
+        stream.max_left = self.max_left
+        return stream.totals(algorithms)
+
+    def service_rank(self, cylinder, algorithm='SCAN'):
+        """
+        Cuántas solicitudes se atienden antes de la primera del cilindro dado, en O(log N)
+
+        SCAN y LOOK atienden primero la derecha subiendo y después la izquierda bajando;
+        C-SCAN y C-LOOK atienden la izquierda subiendo después del salto.
+        """
+        if algorithm not in self.CLOSED_FORM:
+            raise ValueError(f"Algoritmo desconocido: {algorithm!r}. Opciones: {', '.join(self.CLOSED_FORM)}")
+        self._check_cylinders([cylinder])
+        if not self.counts[cylinder]:
+            raise ValueError(f"No hay solicitudes pendientes en el cilindro {cylinder}")
+
+        before = self._tree.prefix_sum(cylinder)
+        if cylinder >= self.initial_position:
+            return before - self.num_left
+        if algorithm in ('SCAN', 'LOOK'):
+            return self.num_right + self.num_left - before - self.counts[cylinder]
+        return self.num_right + before
+
+    def sorted_requests(self, engine='python'):
+        """
+        Solicitudes de menor a mayor, expandiendo los conteos (O(N + n), sin ordenar)
+
+        Retorna:
+            Una lista de Python, o un arreglo int32 con engine='numpy'
+        """
+        if engine == 'numpy':
+            import numpy as np
+            return np.repeat(np.arange(self.num_cylinders, dtype=np.int32), self.counts)
+        return list(itertools.chain.from_iterable(
+            itertools.repeat(cylinder, amount) for cylinder, amount in enumerate(self.counts) if amount))
+
+    def service_order(self, algorithm='SCAN', engine='python'):
+        """Orden de servicio (sin el recorrido hasta el final del disco) sacado de los conteos"""
+        if algorithm not in self.CLOSED_FORM:
+            raise ValueError(f"Algoritmo desconocido: {algorithm!r}. Opciones: {', '.join(self.CLOSED_FORM)}")
+        sorted_requests = self.sorted_requests(engine)
+        left, right = sorted_requests[:self.num_left], sorted_requests[self.num_left:]
+        if algorithm in ('SCAN', 'LOOK'):
+            left = left[::-1]
+        if engine == 'numpy':
+            import numpy as np
+            return np.concatenate((right, left))
+        return right + left
+
+
+def apply_changes(requests, changes):
+    """
+    Aplica a la lista en orden de llegada los cambios hechos con add/cancel
+
+    Las solicitudes agregadas van al final; cada cancelación quita la solicitud más
+    antigua de ese cilindro. Cuesta una pasada O(n) por lote, así que el planificador
+    solo la hace cuando alguien necesita el orden de llegada.
+
+    Parámetros:
+        requests: Lista o arreglo de NumPy original (no se modifica)
+        changes: Lista de tuplas ('add' | 'cancel', cilindros)
+
+    Retorna:
+        Una lista nueva (o un arreglo nuevo si requests era de NumPy)
+    """
+    is_numpy = hasattr(requests, 'dtype')
+    if is_numpy:
+        import numpy as np
+
+    for operation, cylinders in changes:
+        if operation == 'add':
+            if is_numpy:
+                requests = np.concatenate((requests, np.asarray(cylinders, dtype=requests.dtype)))
+            else:
+                requests = list(requests) + list(cylinders)
+            continue
+
+        pending = Counter(cylinders)
+        if is_numpy:
+            # Solo se recorren en Python las posiciones de los cilindros cancelados
+            dropped = []
+            for position in np.flatnonzero(np.isin(requests, list(pending))):
+                cylinder = int(requests[position])
+                if pending[cylinder]:
+                    pending[cylinder] -= 1
+                    dropped.append(position)
+            requests = np.delete(requests, dropped)
+        else:
+            kept = []
+            for request in requests:
+                if pending.get(request):
+                    pending[request] -= 1
+                else:
+                    kept.append(request)
+            requests = kept
+    return requests
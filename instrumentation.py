@@ -0,0 +1,180 @@
+"""
+Instrumentación opcional de DiskScheduler
+Tiempos por fase (generación, índice, cada algoritmo, gráficas), contadores
+(solicitudes atendidas, cambios de dirección, saltos circulares, bytes de historiales),
+callbacks por evento y un contexto que activa cProfile y tracemalloc. Desactivada
+(NULL_INSTRUMENTATION) no hace nada: cada fase es un contexto vacío compartido
+"""
+
+import json
+import time
+
+
+# Algoritmos que vuelven al principio del disco en vez de cambiar de dirección
+CIRCULAR_ALGORITHMS = ('C-SCAN', 'C-LOOK')
+
+# Funciones que se incluyen en el reporte de cProfile
+PROFILE_TOP = 25
+
+
+class _NullPhase:
+    """Contexto que no hace nada (una sola instancia compartida)"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class NullInstrumentation:
+    """Instrumentación desactivada: la que usa DiskScheduler por defecto"""
+
+    enabled = False
+
+    def phase(self, name):
+        return _NULL_PHASE
+
+    def count(self, name, amount=1):
+        pass
+
+    def record_result(self, result, num_requests):
+        pass
+
+
+NULL_INSTRUMENTATION = NullInstrumentation()
+
+
+class _Phase:
+    """Mide una fase y avisa a los hooks al empezar y al terminar"""
+
+    __slots__ = ('instrumentation', 'name', 'start')
+
+    def __init__(self, instrumentation, name):
+        self.instrumentation = instrumentation
+        self.name = name
+
+    def __enter__(self):
+        self.instrumentation._emit('start', self.name, None)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        elapsed = time.perf_counter() - self.start
+        stats = self.instrumentation.phases.setdefault(self.name, {'calls': 0, 'seconds': 0.0})
+        stats['calls'] += 1
+        stats['seconds'] += elapsed
+        self.instrumentation._emit('end', self.name, elapsed)
+        return False
+
+
+class Instrumentation:
+    """
+    Instrumentación activada
+
+    Uso:
+        instrumentation = Instrumentation()
+        scheduler = DiskScheduler(..., instrumentation=instrumentation)
+        with instrumentation.profiling():   # opcional: cProfile + tracemalloc
+            results = scheduler.run_all_algorithms()
+        print(instrumentation.report())
+
+    Los hooks son funciones hook(evento, fase, segundos) con evento 'start' o 'end'
+    (segundos es None al empezar); sirven para mandar las fases a otro sistema.
+    """
+
+    enabled = True
+
+    def __init__(self, hooks=()):
+        self.phases = {}
+        self.counters = {}
+        self.hooks = list(hooks)
+        self.profile_stats = None
+        self.memory_peak_bytes = None
+
+    def add_hook(self, hook):
+        self.hooks.append(hook)
+
+    def _emit(self, event, name, elapsed):
+        for hook in self.hooks:
+            hook(event, name, elapsed)
+
+    def phase(self, name):
+        """Contexto que suma el tiempo de una fase (se puede repetir y anidar)"""
+        return _Phase(self, name)
+
+    def count(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def record_result(self, result, num_requests):
+        """
+        Suma los contadores de un ScheduleResult (una pasada vectorizada por el historial)
+
+        requests_processed cuenta num_requests, no los pasos del historial (ver
+        ScheduleResult.average_service_ms).
+        """
+        import numpy as np
+        steps = np.diff(np.asarray(result, dtype=np.int64))
+        moves = np.sign(steps[steps != 0])
+
+        self.count('requests_processed', num_requests)
+        self.count('history_bytes', result.nbytes)
+        if result.algorithm in CIRCULAR_ALGORITHMS:
+            # En los circulares, cada bajada es el salto de vuelta al principio
+            self.count('wraparounds', int((moves < 0).sum()))
+        else:
+            self.count('direction_reversals', int((moves[1:] != moves[:-1]).sum()))
+
+    def profiling(self, trace_memory=True):
+        """Contexto que perfila con cProfile (y tracemalloc) lo que pase adentro"""
+        return _Profiling(self, trace_memory)
+
+    def report(self):
+        """Reporte como diccionario listo para JSON"""
+        return {
+            'phases': {name: dict(stats) for name, stats in self.phases.items()},
+            'counters': dict(self.counters),
+            'memory_peak_bytes': self.memory_peak_bytes,
+            'profile': self.profile_stats,
+        }
+
+    def write_json(self, path):
+        with open(path, 'w') as report_file:
+            json.dump(self.report(), report_file, indent=2)
+        return path
+
+
+class _Profiling:
+    def __init__(self, instrumentation, trace_memory):
+        self.instrumentation = instrumentation
+        self.trace_memory = trace_memory
+
+    def __enter__(self):
+        import cProfile
+        if self.trace_memory:
+            import tracemalloc
+            tracemalloc.start()
+        self.profiler = cProfile.Profile()
+        self.profiler.enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        import pstats
+        self.profiler.disable()
+        if self.trace_memory:
+            import tracemalloc
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            self.instrumentation.memory_peak_bytes = peak
+
+        stats = pstats.Stats(self.profiler)
+        rows = []
+        for (filename, line, function), (_, calls, own, cumulative, _) in stats.stats.items():
+            rows.append({'function': f"{filename}:{line}({function})", 'calls': calls,
+                         'own_seconds': own, 'cumulative_seconds': cumulative})
+        rows.sort(key=lambda row: row['cumulative_seconds'], reverse=True)
+        self.instrumentation.profile_stats = rows[:PROFILE_TOP]
+        return False
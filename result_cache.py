@@ -0,0 +1,119 @@
+"""
+Caché en disco de resultados de los algoritmos, direccionada por contenido
+La clave es un hash de las solicitudes + parámetros (cilindros, posición inicial) +
+algoritmo + versión de los algoritmos, así que la misma carga nunca se recalcula.
+Cada entrada es un .npz comprimido con el historial y el total; al leerla, el historial
+se descomprime una vez a un .npy y desde ahí se abre con memoria mapeada
+"""
+
+import hashlib
+import os
+import tempfile
+
+import numpy as np
+
+from disk_scheduling import ALGORITHM_VERSION, ScheduleResult
+
+
+DEFAULT_CACHE_DIR = '.disk_scheduling_cache'  # el mismo que usa --cache sin argumento
+DEFAULT_MAX_BYTES = 1 << 30  # 1 GiB
+
+
+class ResultCache:
+    """
+    Caché LRU acotada por tamaño
+
+    Cada acceso actualiza la fecha de modificación de la entrada; cuando el directorio
+    pasa de max_bytes se borran primero las entradas usadas hace más tiempo.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, scheduler, algorithm):
+        """Clave de un algoritmo sobre la carga y los parámetros de un planificador"""
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(scheduler.requests_digest.encode())
+        digest.update(f"|{scheduler.num_cylinders}|{scheduler.initial_position}|{algorithm}|"
+                      f"v{ALGORITHM_VERSION}".encode())
+        return digest.hexdigest()
+
+    def _paths(self, key):
+        base = os.path.join(self.directory, key)
+        return base + '.npz', base + '.npy'
+
+    def _write_atomically(self, path, write):
+        """
+        Escribe con write(archivo) en un temporal único del mismo directorio y lo renombra
+
+        El nombre sale de mkstemp, así que varios procesos pueden escribir la misma
+        entrada a la vez sin pisarse; el último os.replace gana y el contenido es igual.
+        """
+        descriptor, temporary_path = tempfile.mkstemp(prefix=os.path.basename(path) + '.', suffix='.tmp',
+                                                      dir=self.directory)
+        try:
+            with os.fdopen(descriptor, 'wb') as temporary_file:
+                write(temporary_file)
+            os.replace(temporary_path, path)
+        except BaseException:
+            os.remove(temporary_path)
+            raise
+
+    def get(self, key):
+        """
+        Busca una entrada
+
+        Retorna:
+            Un ScheduleResult cuyo historial es un np.memmap de solo lectura, o None
+        """
+        archive_path, history_path = self._paths(key)
+        if not os.path.exists(archive_path):
+            return None
+
+        with np.load(archive_path) as archive:
+            algorithm = str(archive['algorithm'])
+            total_movement = int(archive['total_movement'])
+            if not os.path.exists(history_path):
+                # Primera lectura: descomprimimos una sola vez para poder mapearlo
+                positions = archive['positions']
+                self._write_atomically(history_path, lambda history_file: np.save(history_file, positions))
+
+        for path in (archive_path, history_path):
+            os.utime(path)
+        return ScheduleResult(algorithm, np.load(history_path, mmap_mode='r'), total_movement)
+
+    def put(self, key, result):
+        """Guarda un ScheduleResult comprimido y aplica la política de desalojo"""
+        archive_path, _ = self._paths(key)
+        self._write_atomically(archive_path, lambda archive_file: np.savez_compressed(
+            archive_file, positions=np.asarray(result, dtype=np.int32),
+            total_movement=np.int64(result.total_movement), algorithm=np.str_(result.algorithm)))
+        self.evict()
+
+    def evict(self):
+        """Borra las entradas menos usadas hasta que el directorio quepa en max_bytes"""
+        entries = {}
+        for name in os.listdir(self.directory):
+            key, extension = os.path.splitext(name)
+            if extension not in ('.npz', '.npy'):
+                continue
+            stat = os.stat(os.path.join(self.directory, name))
+            size, last_used = entries.get(key, (0, 0.0))
+            entries[key] = (size + stat.st_size, max(last_used, stat.st_mtime))
+
+        total = sum(size for size, _ in entries.values())
+        for key, (size, _) in sorted(entries.items(), key=lambda item: item[1][1]):
+            if total <= self.max_bytes:
+                break
+            for path in self._paths(key):
+                if os.path.exists(path):
+                    os.remove(path)
+            total -= size
+
+    def clear(self):
+        """Borra todas las entradas"""
+        for name in os.listdir(self.directory):
+            if os.path.splitext(name)[1] in ('.npz', '.npy'):
+                os.remove(os.path.join(self.directory, name))
@@ -0,0 +1,361 @@
+"""
+Simulación en línea (por eventos) de los algoritmos de planificación de disco
+A diferencia de DiskScheduler, aquí las solicitudes no están todas en la cola desde t=0:
+cada una llega en su momento (Poisson o desde una traza) y el algoritmo atiende la cola
+tal como va quedando. Así se pueden medir tiempos de espera, latencia de cola (p99) e
+inanición, no solo el movimiento total
+"""
+
+import heapq
+from collections import deque
+
+import numpy as np
+
+from disk_scheduling import ALGORITHMS, MS_PER_CYLINDER
+
+
+# Percentiles de latencia que se reportan por defecto
+LATENCY_PERCENTILES = (50, 99, 99.9)
+
+
+class _FifoQueue:
+    """Cola FCFS: se atiende en orden de llegada"""
+
+    def __init__(self, num_cylinders):
+        self._queue = deque()
+
+    def __len__(self):
+        return len(self._queue)
+
+    def push(self, cylinder, request_id, head):
+        self._queue.append((cylinder, request_id))
+
+    def pop(self, head):
+        cylinder, request_id = self._queue.popleft()
+        return cylinder, request_id, abs(head - cylinder)
+
+    def finish(self, head):
+        """Movimiento que falta al vaciarse la cola por última vez (ninguno)"""
+        return 0
+
+
+class _SstfQueue:
+    """
+    Cola SSTF con dos montículos: 'up' (cilindros >= cabezal, mínimo arriba) y 'down'
+    (cilindros < cabezal, máximo arriba). El más cercano siempre está en la cima de uno
+    de los dos, así que insertar y despachar cuesta O(log n).
+    """
+
+    def __init__(self, num_cylinders):
+        self._up = []
+        self._down = []
+
+    def __len__(self):
+        return len(self._up) + len(self._down)
+
+    def push(self, cylinder, request_id, head):
+        if cylinder >= head:
+            heapq.heappush(self._up, (cylinder, request_id))
+        else:
+            heapq.heappush(self._down, (-cylinder, request_id))
+
+    def pop(self, head):
+        # Empate: preferimos subir, igual que DiskScheduler.sstf()
+        if self._up and (not self._down or self._up[0][0] - head <= head + self._down[0][0]):
+            cylinder, request_id = heapq.heappop(self._up)
+        else:
+            negative_cylinder, request_id = heapq.heappop(self._down)
+            cylinder = -negative_cylinder
+        return cylinder, request_id, abs(head - cylinder)
+
+    def finish(self, head):
+        return 0
+
+
+class _ElevatorQueue:
+    """
+    Cola SCAN/LOOK: un montículo por dirección. Lo que llega delante del cabezal se
+    atiende en esta pasada; lo que llega detrás espera a la pasada de vuelta.
+    Con SCAN el cabezal llega hasta el extremo del disco antes de dar la vuelta.
+    """
+
+    def __init__(self, num_cylinders, look=False):
+        self.num_cylinders = num_cylinders
+        self.look = look
+        self.direction = 1  # Empezamos subiendo, como en DiskScheduler.scan()
+        self._up = []
+        self._down = []
+
+    def __len__(self):
+        return len(self._up) + len(self._down)
+
+    def push(self, cylinder, request_id, head):
+        if cylinder > head or (cylinder == head and self.direction > 0):
+            heapq.heappush(self._up, (cylinder, request_id))
+        else:
+            heapq.heappush(self._down, (-cylinder, request_id))
+
+    def pop(self, head):
+        travel = 0
+        if self.direction > 0 and not self._up:
+            # Damos la vuelta; SCAN primero llega hasta el último cilindro
+            if not self.look:
+                travel = (self.num_cylinders - 1) - head
+                head = self.num_cylinders - 1
+            self.direction = -1
+        elif self.direction < 0 and not self._down:
+            if not self.look:
+                travel = head
+                head = 0
+            self.direction = 1
+
+        if self.direction > 0:
+            cylinder, request_id = heapq.heappop(self._up)
+        else:
+            negative_cylinder, request_id = heapq.heappop(self._down)
+            cylinder = -negative_cylinder
+        return cylinder, request_id, travel + abs(head - cylinder)
+
+    def finish(self, head):
+        # Como DiskScheduler.scan(): la última pasada termina en la última solicitud
+        return 0
+
+
+class _CircularQueue:
+    """
+    Cola C-SCAN/C-LOOK: siempre subiendo. Lo que llega detrás del cabezal va a la
+    próxima vuelta; al terminar la vuelta actual las colas se intercambian en O(1).
+    El salto de regreso cuenta como movimiento, igual que en DiskScheduler.c_scan().
+    También como ahí, con C-SCAN la pasada que sale de la posición inicial siempre llega
+    al último cilindro, aunque después no haya que dar la vuelta (ver finish()); si
+    todas las solicitudes llegan en t=0 el movimiento total es el mismo que el de c_scan().
+    """
+
+    def __init__(self, num_cylinders, look=False):
+        self.num_cylinders = num_cylinders
+        self.look = look
+        self._current = []
+        self._next = []
+        self._wrapped = False
+
+    def __len__(self):
+        return len(self._current) + len(self._next)
+
+    def push(self, cylinder, request_id, head):
+        heapq.heappush(self._current if cylinder >= head else self._next, (cylinder, request_id))
+
+    def pop(self, head):
+        travel = 0
+        if not self._current:
+            self._current, self._next = self._next, self._current
+            self._wrapped = True
+            if not self.look:
+                # Hasta el final del disco y salto al cilindro 0
+                travel = 2 * (self.num_cylinders - 1) - head
+                head = 0
+        cylinder, request_id = heapq.heappop(self._current)
+        return cylinder, request_id, travel + abs(head - cylinder)
+
+    def finish(self, head):
+        """Con C-SCAN, lo que falta de la primera pasada hasta el último cilindro"""
+        if self.look or self._wrapped:
+            return 0
+        return (self.num_cylinders - 1) - head
+
+
+# Cola pendiente que usa cada algoritmo en modo en línea
+QUEUES = {
+    'FCFS': _FifoQueue,
+    'SSTF': _SstfQueue,
+    'SCAN': lambda num_cylinders: _ElevatorQueue(num_cylinders, look=False),
+    'LOOK': lambda num_cylinders: _ElevatorQueue(num_cylinders, look=True),
+    'C-SCAN': lambda num_cylinders: _CircularQueue(num_cylinders, look=False),
+    'C-LOOK': lambda num_cylinders: _CircularQueue(num_cylinders, look=True),
+}
+
+
+class SimulationResult:
+    """Tiempos por solicitud de una simulación en línea (todo en milisegundos)"""
+
+    __slots__ = ('algorithm', 'arrival_ms', 'start_ms', 'finish_ms', 'total_movement')
+
+    def __init__(self, algorithm, arrival_ms, start_ms, finish_ms, total_movement):
+        self.algorithm = algorithm
+        self.arrival_ms = arrival_ms
+        self.start_ms = start_ms
+        self.finish_ms = finish_ms
+        self.total_movement = total_movement
+
+    @property
+    def wait_ms(self):
+        """Tiempo que cada solicitud pasó en la cola antes de empezar a atenderse"""
+        return self.start_ms - self.arrival_ms
+
+    @property
+    def latency_ms(self):
+        """Tiempo de respuesta de cada solicitud: desde que llega hasta que termina"""
+        return self.finish_ms - self.arrival_ms
+
+    @property
+    def makespan_ms(self):
+        if len(self.finish_ms) == 0:
+            return 0.0
+        return float(self.finish_ms.max() - self.arrival_ms.min())
+
+    @property
+    def throughput(self):
+        """Solicitudes atendidas por segundo"""
+        makespan = self.makespan_ms
+        return len(self.finish_ms) / (makespan / 1000.0) if makespan > 0 else 0.0
+
+    def latency_percentiles(self, percentiles=LATENCY_PERCENTILES):
+        """Diccionario {percentil: latencia_ms}"""
+        if len(self.finish_ms) == 0:
+            return {percentile: 0.0 for percentile in percentiles}
+        values = np.percentile(self.latency_ms, percentiles)
+        return {percentile: float(value) for percentile, value in zip(percentiles, values)}
+
+    def summary(self):
+        """Métricas principales en un diccionario"""
+        summary = {
+            'algorithm': self.algorithm,
+            'requests': len(self.finish_ms),
+            'total_movement': self.total_movement,
+            'mean_wait_ms': float(self.wait_ms.mean()) if len(self.finish_ms) else 0.0,
+            'max_wait_ms': float(self.wait_ms.max()) if len(self.finish_ms) else 0.0,
+            'throughput_per_s': self.throughput,
+        }
+        for percentile, value in self.latency_percentiles().items():
+            summary[f'p{percentile:g}_ms'] = value
+        return summary
+
+
+def poisson_arrivals(num_requests, rate_per_second, rng=None):
+    """
+    Tiempos de llegada (ms) de un proceso de Poisson
+
+    Parámetros:
+        num_requests: Cuántas llegadas generar
+        rate_per_second: Solicitudes por segundo en promedio
+        rng: Generador de NumPy (por defecto uno nuevo sin semilla)
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    return np.cumsum(rng.exponential(1000.0 / rate_per_second, size=num_requests))
+
+
+def simulate(scheduler, algorithm, arrival_ms=None, rate_per_second=None, rng=None,
+             ms_per_cylinder=MS_PER_CYLINDER):
+    """
+    Simula la llegada continua de las solicitudes de un DiskScheduler
+
+    Parámetros:
+        scheduler: DiskScheduler con las solicitudes (cilindros) y la posición inicial
+        algorithm: Nombre del algoritmo ('FCFS', 'SSTF', 'SCAN', ...)
+        arrival_ms: Tiempo de llegada de cada solicitud en ms (por ejemplo de una traza)
+        rate_per_second: Si no hay arrival_ms, se generan llegadas de Poisson con esta tasa
+        rng: Generador de NumPy para las llegadas de Poisson
+        ms_per_cylinder: Costo de mover el cabezal un cilindro
+
+    Retorna:
+        Un SimulationResult con los tiempos de cada solicitud (en orden de llegada)
+    """
+    if algorithm not in QUEUES:
+        raise ValueError(f"Algoritmo desconocido: {algorithm!r}. Opciones: {', '.join(QUEUES)}")
+
+    cylinders = np.asarray(scheduler.requests)
+    num_requests = len(cylinders)
+    if arrival_ms is None:
+        if rate_per_second is None:
+            raise ValueError("Hay que dar arrival_ms o rate_per_second")
+        arrival_ms = poisson_arrivals(num_requests, rate_per_second, rng)
+    arrival_ms = np.asarray(arrival_ms, dtype=np.float64)
+    if len(arrival_ms) != num_requests:
+        raise ValueError("arrival_ms debe tener un tiempo por solicitud")
+
+    # Procesamos las llegadas en orden de tiempo (estable para empates)
+    order = np.argsort(arrival_ms, kind='stable')
+    arrivals = arrival_ms[order]
+    arrival_list = arrivals.tolist()
+    cylinder_list = cylinders[order].tolist()
+
+    queue = QUEUES[algorithm](scheduler.num_cylinders)
+    start = [0.0] * num_requests
+    finish = [0.0] * num_requests
+    head = scheduler.initial_position
+    now = 0.0
+    total_movement = 0
+    next_arrival = 0
+
+    while next_arrival < num_requests or len(queue):
+        # Si no hay nada pendiente, el disco espera a la próxima llegada
+        if not len(queue) and arrival_list[next_arrival] > now:
+            now = arrival_list[next_arrival]
+        while next_arrival < num_requests and arrival_list[next_arrival] <= now:
+            queue.push(cylinder_list[next_arrival], next_arrival, head)
+            next_arrival += 1
+
+        cylinder, request_id, travel = queue.pop(head)
+        start[request_id] = now
+        now += travel * ms_per_cylinder
+        finish[request_id] = now
+        total_movement += travel
+        head = cylinder
+
+    # El recorrido que queda después de la última solicitud no atrasa a nadie, pero sí
+    # es movimiento del cabezal
+    total_movement += queue.finish(head)
+    return SimulationResult(algorithm, arrivals, np.array(start), np.array(finish), total_movement)
+
+
+def run_simulations(scheduler, algorithms=None, **kwargs):
+    """
+    Simula varios algoritmos sobre las mismas llegadas
+
+    Los parámetros extra se pasan a simulate(). Si se usa rate_per_second, las llegadas
+    se generan una sola vez para que todos los algoritmos vean la misma carga.
+
+    Retorna:
+        Un diccionario {algoritmo: SimulationResult}
+    """
+    if algorithms is None:
+        algorithms = [algorithm for algorithm in ALGORITHMS if algorithm in QUEUES]
+    if kwargs.get('arrival_ms') is None and kwargs.get('rate_per_second') is not None:
+        kwargs['arrival_ms'] = poisson_arrivals(scheduler.num_requests, kwargs.pop('rate_per_second'),
+                                                kwargs.pop('rng', None))
+    return {algorithm: simulate(scheduler, algorithm, **kwargs) for algorithm in algorithms}
+
+
+def print_simulation_results(results):
+    """Imprime la latencia y el throughput de cada algoritmo para compararlos"""
+    print("=" * 78)
+    print("SIMULACIÓN EN LÍNEA - LATENCIA POR SOLICITUD")
+    print("=" * 78)
+    print(f"{'Algoritmo':<10}{'Espera media':>15}{'p50':>15}{'p99':>15}{'p99.9':>15}{'Solic/s':>8}")
+    for algorithm, result in results.items():
+        summary = result.summary()
+        columns = [summary['mean_wait_ms'], summary['p50_ms'], summary['p99_ms'], summary['p99.9_ms']]
+        print(f"{algorithm:<10}" + "".join(f"{value:>12.1f} ms" for value in columns) +
+              f"{summary['throughput_per_s']:>8.2f}")
+    print("=" * 78)
+
+
+def main():
+    """Función principal: el escenario del enunciado con llegadas de Poisson"""
+    from disk_scheduling import DiskScheduler
+
+    NUM_CYLINDERS = 5000
+    NUM_REQUESTS = 1000
+    INITIAL_POSITION = 2500
+    ARRIVAL_RATE = 1.0  # Solicitudes por segundo
+
+    rng = np.random.default_rng(0)
+    scheduler = DiskScheduler(NUM_CYLINDERS, NUM_REQUESTS, INITIAL_POSITION, engine='numpy', rng=rng)
+    results = run_simulations(scheduler, rate_per_second=ARRIVAL_RATE, rng=rng)
+    print_simulation_results(results)
+
+    return scheduler, results
+
+
+if __name__ == "__main__":
+    scheduler, results = main()
@@ -0,0 +1,172 @@
+"""
+Barrido de parámetros tipo Monte Carlo para los algoritmos de planificación de disco
+Ejecuta muchos escenarios (cilindros × solicitudes × posición inicial × semillas) en
+paralelo y resume el movimiento total de cada algoritmo con media, desviación y percentiles
+"""
+
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from disk_scheduling import DEFAULT_ALGORITHMS, DiskScheduler
+
+
+# Percentiles que se reportan por defecto en la tabla resumen
+DEFAULT_PERCENTILES = (50, 95, 99)
+
+
+def build_grid(num_cylinders, num_requests, initial_positions, seeds):
+    """
+    Arma la lista de escenarios como producto cartesiano de los parámetros
+
+    Parámetros:
+        num_cylinders: Lista con los tamaños de disco a probar
+        num_requests: Lista con las cantidades de solicitudes
+        initial_positions: Lista con las posiciones iniciales del cabezal
+        seeds: Lista de semillas (cada una es una repetición independiente)
+
+    Retorna:
+        Una lista de tuplas (cilindros, solicitudes, posición_inicial, semilla)
+    """
+    grid = []
+    for cylinders, requests, position, seed in itertools.product(
+            num_cylinders, num_requests, initial_positions, seeds):
+        if not 0 <= position < cylinders:
+            raise ValueError(f"La posición inicial {position} no existe en un disco de {cylinders} cilindros")
+        grid.append((cylinders, requests, position, seed))
+    return grid
+
+
+def scenario_rng(num_cylinders, num_requests, seed):
+    """
+    Crea el generador de NumPy de un escenario
+
+    Cada (semilla, cilindros, solicitudes) tiene su propio flujo independiente gracias a
+    SeedSequence, así que el resultado no depende de qué proceso ejecute la tarea ni en qué
+    orden. Las distintas posiciones iniciales comparten la misma carga a propósito: así las
+    diferencias entre posiciones no se mezclan con el ruido de la carga.
+    """
+    sequence = np.random.SeedSequence(entropy=seed, spawn_key=(num_cylinders, num_requests))
+    return np.random.default_rng(sequence)
+
+
+def _run_task(task):
+    """Ejecuta un escenario en un proceso trabajador y devuelve solo los totales"""
+    (num_cylinders, num_requests, initial_position, seed), algorithms = task
+    rng = scenario_rng(num_cylinders, num_requests, seed)
+    scheduler = DiskScheduler(num_cylinders, num_requests, initial_position, engine='numpy', rng=rng)
+    return {
+        'num_cylinders': num_cylinders,
+        'num_requests': num_requests,
+        'initial_position': initial_position,
+        'seed': seed,
+        'totals': scheduler.totals(algorithms),
+    }
+
+
+def run_sweep(num_cylinders, num_requests, initial_positions, seeds, algorithms=None, max_workers=None):
+    """
+    Ejecuta todo el barrido repartiendo los escenarios en un ProcessPoolExecutor
+
+    Parámetros:
+        num_cylinders, num_requests, initial_positions, seeds: Ver build_grid()
+        algorithms: Algoritmos a comparar (por defecto DEFAULT_ALGORITHMS)
+        max_workers: Número de procesos (por defecto uno por núcleo; 1 = sin procesos)
+
+    Retorna:
+        Una lista de registros, uno por escenario, con los totales de cada algoritmo
+    """
+    if algorithms is None:
+        algorithms = list(DEFAULT_ALGORITHMS)
+
+    grid = build_grid(num_cylinders, num_requests, initial_positions, seeds)
+    tasks = [(scenario, algorithms) for scenario in grid]
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    if max_workers == 1 or len(tasks) <= 1:
+        return [_run_task(task) for task in tasks]
+
+    # Varios escenarios por envío para que el costo de comunicación no domine
+    chunksize = max(1, len(tasks) // (max_workers * 4))
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_run_task, tasks, chunksize=chunksize))
+
+
+def percentile_column(percentile):
+    """Nombre de la columna de un percentil en las filas del resumen (p50, p99.9, ...)"""
+    return f'p{percentile}'
+
+
+def summarize_sweep(records, percentiles=DEFAULT_PERCENTILES):
+    """
+    Agrupa los registros por escenario (sin la semilla) y algoritmo
+
+    Retorna:
+        Una lista de filas con runs, mean, std y un valor por percentil (p50, p95, ...)
+    """
+    groups = {}
+    for record in records:
+        scenario = (record['num_cylinders'], record['num_requests'], record['initial_position'])
+        for algorithm, total in record['totals'].items():
+            groups.setdefault(scenario + (algorithm,), []).append(total)
+
+    rows = []
+    for (cylinders, requests, position, algorithm), totals in groups.items():
+        values = np.asarray(totals, dtype=np.float64)
+        row = {
+            'num_cylinders': cylinders,
+            'num_requests': requests,
+            'initial_position': position,
+            'algorithm': algorithm,
+            'runs': len(values),
+            'mean': float(values.mean()),
+            'std': float(values.std(ddof=1)) if len(values) > 1 else 0.0,
+        }
+        for percentile, value in zip(percentiles, np.percentile(values, percentiles)):
+            row[percentile_column(percentile)] = float(value)
+        rows.append(row)
+    return rows
+
+
+def format_sweep_table(rows, percentiles=DEFAULT_PERCENTILES):
+    """
+    Convierte las filas del resumen en una tabla de texto compacta
+
+    percentiles tiene que ser el mismo que se le pasó a summarize_sweep().
+    """
+    if not rows:
+        return "(sin resultados)"
+
+    percentile_columns = [percentile_column(percentile) for percentile in percentiles]
+    header = ['cilindros', 'solicitudes', 'inicio', 'algoritmo', 'runs', 'media', 'desv'] + percentile_columns
+    lines = [header]
+    for row in rows:
+        lines.append([
+            str(row['num_cylinders']), str(row['num_requests']), str(row['initial_position']),
+            row['algorithm'], str(row['runs']), f"{row['mean']:.1f}", f"{row['std']:.1f}",
+        ] + [f"{row[column]:.1f}" for column in percentile_columns])
+
+    widths = [max(len(line[i]) for line in lines) for i in range(len(header))]
+    return "\n".join("  ".join(cell.rjust(width) for cell, width in zip(line, widths)) for line in lines)
+
+
+def main():
+    """Función principal: un barrido pequeño alrededor del escenario del enunciado"""
+    NUM_CYLINDERS = [5000]
+    NUM_REQUESTS = [1000, 10000]
+    INITIAL_POSITIONS = [0, 2500, 4999]
+    SEEDS = list(range(20))
+
+    print("\nEjecutando barrido de parámetros...")
+    records = run_sweep(NUM_CYLINDERS, NUM_REQUESTS, INITIAL_POSITIONS, SEEDS)
+    print(f"Escenarios ejecutados: {len(records)}\n")
+    print(format_sweep_table(summarize_sweep(records)))
+
+    return records
+
+
+if __name__ == "__main__":
+    records = main()
@@ -0,0 +1,538 @@
+"""
+Pruebas de equivalencia de los algoritmos de planificación de disco
+Compara el motor 'python' (bucles) con el motor 'numpy' en el orden de servicio y el
+movimiento total de cada algoritmo registrado, y fija totals()/StreamingTotals y la
+carga incremental contra las ejecuciones completas
+
+Uso:
+    python -m pytest -q
+"""
+
+import os
+import random
+
+import numpy as np
+import pytest
+
+from disk_scheduling import ALGORITHMS, DiskScheduler, StreamingTotals
+from simulation import QUEUES, simulate
+
+
+# Casos borde: (cilindros, posición inicial, solicitudes)
+EDGE_CASES = [
+    (10, 3, []),                  # Sin solicitudes
+    (1, 0, [0, 0, 0]),            # Un solo cilindro
+    (10, 0, [0, 5, 5, 9, 2]),     # Cabezal en el cilindro 0
+    (10, 9, [9, 0, 9, 4, 8]),     # Cabezal en el último cilindro
+    (20, 7, [7, 7, 3, 3, 15, 15]),  # Cilindros repetidos (y en la posición inicial)
+    (20, 7, [3, 1, 0]),           # Todo a la izquierda
+    (20, 7, [8, 19, 12]),         # Todo a la derecha
+]
+
+
+def random_cases(count, seed=0, max_cylinders=60, max_requests=40):
+    """Casos aleatorios reproducibles con los mismos campos que EDGE_CASES"""
+    rng = random.Random(seed)
+    cases = []
+    for _ in range(count):
+        num_cylinders = rng.randint(1, max_cylinders)
+        initial_position = rng.randrange(num_cylinders)
+        requests = [rng.randrange(num_cylinders) for _ in range(rng.randint(0, max_requests))]
+        cases.append((num_cylinders, initial_position, requests))
+    return cases
+
+
+CASES = EDGE_CASES + random_cases(300)
+
+
+def make_scheduler(engine, num_cylinders, initial_position, requests):
+    if engine == 'numpy':
+        requests = np.asarray(requests, dtype=np.int32)
+    else:
+        requests = list(requests)
+    return DiskScheduler(num_cylinders, initial_position=initial_position, engine=engine, requests=requests)
+
+
+def full_totals(num_cylinders, initial_position, requests):
+    """Movimiento total de cada algoritmo ejecutado completo con el motor 'python'"""
+    scheduler = make_scheduler('python', num_cylinders, initial_position, requests)
+    return {name: scheduler.run(name).total_movement for name in ALGORITHMS}
+
+
+@pytest.mark.parametrize('algorithm', list(ALGORITHMS))
+@pytest.mark.parametrize('case', CASES)
+def test_engines_agree(case, algorithm):
+    python_result = make_scheduler('python', *case).run(algorithm)
+    numpy_result = make_scheduler('numpy', *case).run(algorithm)
+
+    assert np.asarray(numpy_result).tolist() == list(python_result)
+    assert numpy_result.total_movement == python_result.total_movement
+    # El total guardado coincide con la suma de los pasos del historial
+    assert python_result.total_movement == int(python_result.seek_distances.sum())
+
+
+@pytest.mark.parametrize('engine', ['python', 'numpy'])
+@pytest.mark.parametrize('case', CASES)
+def test_totals_match_full_runs(case, engine):
+    totals = make_scheduler(engine, *case).totals(list(ALGORITHMS))
+    assert totals == full_totals(*case)
+
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 1000])
+@pytest.mark.parametrize('case', CASES[:60])
+def test_streaming_totals_in_chunks(case, chunk_size):
+    num_cylinders, initial_position, requests = case
+    expected = full_totals(*case)
+
+    for as_numpy in (False, True):
+        stream = StreamingTotals(initial_position, num_cylinders)
+        for start in range(0, len(requests), chunk_size):
+            chunk = requests[start:start + chunk_size]
+            stream.feed(np.asarray(chunk, dtype=np.int32) if as_numpy else chunk)
+        totals = stream.totals()
+        assert totals == {name: expected[name] for name in StreamingTotals.CLOSED_FORM}
+
+
+@pytest.mark.parametrize('engine', ['python', 'numpy'])
+@pytest.mark.parametrize('seed', range(40))
+def test_incremental_matches_full_runs(engine, seed):
+    rng = random.Random(seed)
+    num_cylinders, initial_position, requests = random_cases(1, seed)[0]
+    scheduler = make_scheduler(engine, num_cylinders, initial_position, requests)
+    reference = list(requests)
+
+    for _ in range(6):
+        if reference and rng.random() < 0.5:
+            cancelled = rng.sample(reference, rng.randint(1, min(3, len(reference))))
+            scheduler.cancel_requests(cancelled)
+            for cylinder in cancelled:
+                reference.remove(cylinder)
+        else:
+            added = [rng.randrange(num_cylinders) for _ in range(rng.randint(0, 5))]
+            scheduler.add_requests(added)
+            reference += added
+
+        expected = full_totals(num_cylinders, initial_position, reference)
+        assert scheduler.totals(list(ALGORITHMS)) == expected
+        for name in scheduler.workload.CLOSED_FORM:
+            fresh = make_scheduler(engine, num_cylinders, initial_position, reference).run(name)
+            assert list(scheduler.run(name)) == list(fresh)
+
+    assert list(scheduler.requests) == reference
+    assert scheduler.num_requests == len(reference)
+
+
+def test_cancel_missing_request_changes_nothing():
+    scheduler = make_scheduler('python', 10, 5, [1, 2, 3])
+    with pytest.raises(ValueError):
+        scheduler.cancel_requests([2, 4])
+    assert scheduler.totals(['SCAN'])['SCAN'] == full_totals(10, 5, [1, 2, 3])['SCAN']
+    assert list(scheduler.requests) == [1, 2, 3]
+
+
+def legacy_scan_total(initial_position, requests):
+    """SCAN tal como estaba antes: se devolvía en la última solicitud, sin llegar al final"""
+    left = sorted(r for r in requests if r < initial_position)
+    right = sorted(r for r in requests if r >= initial_position)
+    total, current = 0, initial_position
+    for request in right + left[::-1]:
+        total += abs(current - request)
+        current = request
+    return total
+
+
+def test_scan_goes_to_last_cylinder():
+    # Cabezal en 50 de 100 cilindros: antes se devolvía en 80, ahora llega al 99
+    scheduler = make_scheduler('python', 100, 50, [60, 80, 20])
+    assert legacy_scan_total(50, [60, 80, 20]) == 30 + 60
+    assert scheduler.run('SCAN').total_movement == 49 + 79
+    assert list(scheduler.run('SCAN')) == [50, 60, 80, 99, 20]
+
+
+@pytest.mark.parametrize('case', CASES)
+def test_legacy_scan_is_look(case):
+    num_cylinders, initial_position, requests = case
+    totals = full_totals(*case)
+    assert totals['LOOK'] == legacy_scan_total(initial_position, requests)
+
+    # La diferencia es el tramo de ida y vuelta hasta el último cilindro, que solo se
+    # recorre si quedan solicitudes a la izquierda
+    if any(r < initial_position for r in requests):
+        turn = max([initial_position] + [r for r in requests if r >= initial_position])
+        assert totals['SCAN'] == totals['LOOK'] + 2 * (num_cylinders - 1 - turn)
+    else:
+        assert totals['SCAN'] == totals['LOOK']
+
+
+@pytest.mark.parametrize('dtype', [np.uint8, np.uint16, np.int16, np.uint32, np.int64])
+def test_streaming_totals_small_and_unsigned_dtypes(dtype):
+    stream = StreamingTotals(5, 20)
+    stream.feed(np.array([10, 3, 7], dtype=dtype))
+    stream.feed(np.array([0, 19], dtype=dtype))
+    assert stream.totals() == {name: total for name, total in full_totals(20, 5, [10, 3, 7, 0, 19]).items()
+                               if name in StreamingTotals.CLOSED_FORM}
+    assert stream.fcfs_total == 5 + 7 + 4 + 7 + 19
+
+
+def test_totals_read_memmap_in_chunks(tmp_path):
+    requests = np.random.default_rng(1).integers(0, 500, size=10_000, dtype=np.int32)
+    np.save(tmp_path / 'trace.npy', requests)
+    trace = np.load(tmp_path / 'trace.npy', mmap_mode='r')
+
+    stream = StreamingTotals(250, 500)
+    stream.feed_chunks(trace, chunk_size=999)
+    scheduler = make_scheduler('numpy', 500, 250, trace)
+    assert stream.totals() == scheduler.totals(list(StreamingTotals.CLOSED_FORM))
+    assert scheduler.totals(list(StreamingTotals.CLOSED_FORM)) == make_scheduler('python', 500, 250, requests).totals(
+        list(StreamingTotals.CLOSED_FORM))
+
+
+@pytest.mark.parametrize('algorithm', list(QUEUES))
+@pytest.mark.parametrize('case', CASES)
+def test_online_at_time_zero_matches_offline(case, algorithm):
+    # Si todo llega en t=0 la simulación en línea ve la misma cola que DiskScheduler
+    scheduler = make_scheduler('numpy', *case)
+    result = simulate(scheduler, algorithm, arrival_ms=np.zeros(scheduler.num_requests))
+    assert result.total_movement == full_totals(*case)[algorithm]
+
+
+def test_online_c_scan_reaches_last_cylinder():
+    scheduler = make_scheduler('numpy', 5, 2, [3])
+    assert simulate(scheduler, 'C-SCAN', arrival_ms=[0.0]).total_movement == 2
+    assert simulate(scheduler, 'C-LOOK', arrival_ms=[0.0]).total_movement == 1
+
+
+def test_default_totals_skip_clock_driven_algorithms():
+    from disk_scheduling import DEFAULT_ALGORITHMS, parse_args
+    scheduler = make_scheduler('numpy', 100, 50, [10, 90, 40])
+    assert tuple(scheduler.totals()) == DEFAULT_ALGORITHMS
+    assert 'DEADLINE' not in DEFAULT_ALGORITHMS and 'ANTICIPATORY' not in DEFAULT_ALGORITHMS
+    assert parse_args(['--totals-only']).algorithms == list(DEFAULT_ALGORITHMS)
+    assert parse_args([]).algorithms == list(ALGORITHMS)
+
+
+def test_forced_render_keeps_other_manifest_entries(tmp_path):
+    import json
+    visualizations = pytest.importorskip('visualizations')
+    visualizations.use_headless_backend()
+    rows = [{'algorithm': 'SCAN', 'mean': 10.0, 'std': 1.0, 'runs': 2}]
+
+    def job(name):
+        return ('plot_sweep_scenario', ((100, 10, 50), rows), str(tmp_path / f'{name}.png'), 20)
+
+    visualizations.render_jobs([job('a'), job('b')], str(tmp_path), workers=1)
+    visualizations.render_jobs([job('a')], str(tmp_path), workers=1, skip_unchanged=False)
+    with open(tmp_path / visualizations.MANIFEST_NAME) as manifest_file:
+        assert set(json.load(manifest_file)) == {'a.png', 'b.png'}
+
+
+def test_result_cache_round_trip_leaves_no_temporaries(tmp_path):
+    result_cache = pytest.importorskip('result_cache')
+    cache = result_cache.ResultCache(str(tmp_path))
+    scheduler = DiskScheduler(100, initial_position=50, engine='numpy', requests=np.array([10, 90, 40]),
+                              cache=cache)
+    first = scheduler.run('SCAN')
+    second = scheduler.run('SCAN')
+    assert list(second) == list(first) and second.total_movement == first.total_movement
+    assert sorted(name.rsplit('.', 1)[1] for name in (p.name for p in tmp_path.iterdir())) == ['npy', 'npz']
+
+
+@pytest.mark.parametrize('layout', ['raid0', 'jbod', 'hash'])
+@pytest.mark.parametrize('num_disks, cylinders_per_disk, stripe_cylinders', [(4, 100, 10), (3, 12, 1), (5, 40, 8)])
+def test_disk_array_layout_is_a_bijection(layout, num_disks, cylinders_per_disk, stripe_cylinders):
+    from disk_array import DiskArray
+    array = DiskArray(num_disks, cylinders_per_disk, layout, stripe_cylinders=stripe_cylinders)
+    disks, cylinders = array.map(np.arange(array.num_cylinders))
+    assert len(set(zip(disks.tolist(), cylinders.tolist()))) == array.num_cylinders
+    assert np.bincount(disks, minlength=num_disks).tolist() == [cylinders_per_disk] * num_disks
+    assert cylinders.min() == 0 and cylinders.max() == cylinders_per_disk - 1
+
+
+def test_simulate_array_defaults_to_closed_form():
+    from disk_array import DiskArray, simulate_array
+    array = DiskArray(4, 100, 'hash', stripe_cylinders=10, initial_position=50)
+    requests = np.random.default_rng(2).integers(0, array.num_cylinders, size=500)
+    result = simulate_array(array, requests, max_workers=1)
+    assert result.algorithms == list(StreamingTotals.CLOSED_FORM)
+    assert int(result.requests_per_disk.sum()) == len(requests)
+
+
+def test_cost_models():
+    from cost_models import AccelerationCostModel, LinearCostModel
+    scheduler = make_scheduler('numpy', 100, 50, [60, 80, 20])
+    result = scheduler.run('SCAN')  # 50 -> 60 -> 80 -> 99 -> 20: la visita al 99 no es solicitud
+
+    linear = LinearCostModel(100)
+    assert result.total_service_ms() == linear.total_ms(result) == result.total_movement * 6.0
+    assert linear.step_ms(result).sum() == pytest.approx(linear.total_ms(result))
+    assert result.average_service_ms(scheduler.num_requests) == result.total_movement * 6.0 / 3
+
+    acceleration = AccelerationCostModel(100)
+    assert acceleration.total_ms(result) == pytest.approx(acceleration.step_ms(result).sum())
+    assert acceleration.total_ms(result) == pytest.approx(acceleration.seek_ms(result.seek_distances).sum())
+    # Un modelo más chico que el historial ya no recorta las distancias en silencio
+    with pytest.raises(ValueError):
+        AccelerationCostModel(50).total_ms(result)
+    with pytest.raises(ValueError):
+        AccelerationCostModel(50).step_ms(result)
+
+
+def test_linear_cost_model_accepts_plain_histories():
+    from cost_models import LinearCostModel
+    linear = LinearCostModel(10)
+    assert linear.total_ms(np.array([1, 5, 2])) == (4 + 3) * 6.0
+    assert linear.total_ms([1, 5, 2]) == (4 + 3) * 6.0
+    assert linear.step_ms(np.array([1, 5, 2])).tolist() == [24.0, 18.0]
+    assert linear.average_ms([1, 5, 2], 2) == 21.0
+
+
+def test_plot_averages_are_per_request():
+    visualizations = pytest.importorskip('visualizations')
+    scheduler = make_scheduler('numpy', 100, 50, [60, 80, 20])
+    results = {name: scheduler.run(name) for name in ('SCAN', 'SSTF')}
+    payloads = visualizations.reduce_results(results, scheduler.num_requests)
+    for name, result in results.items():
+        # SCAN tiene un paso más (la visita al 99), pero el promedio es por solicitud
+        assert payloads[name].mean_seek == result.total_movement / 3
+        assert visualizations._mean_seek(result, 3) == payloads[name].mean_seek
+
+
+def test_cost_models_import_without_numpy():
+    import os
+    import subprocess
+    import sys
+    code = "import sys, cost_models; sys.exit('numpy' in sys.modules)"
+    directory = os.path.dirname(os.path.abspath(__file__))
+    assert subprocess.run([sys.executable, '-c', code], cwd=directory).returncode == 0
+
+
+@pytest.mark.parametrize('algorithm', list(ALGORITHMS))
+def test_python_engine_accepts_arrays_without_overflow(algorithm):
+    # Tres saltos de casi 2e9 cilindros: el total no cabe en int32
+    requests = np.array([1_900_000_000, 0, 1_900_000_000], dtype=np.int32)
+    from_array = DiskScheduler(2_000_000_000, initial_position=0, engine='python', requests=requests)
+    from_list = make_scheduler('python', 2_000_000_000, 0, requests.tolist())
+    numpy_engine = make_scheduler('numpy', 2_000_000_000, 0, requests)
+
+    assert from_array.run(algorithm).total_movement == from_list.run(algorithm).total_movement
+    assert from_array.run(algorithm).total_movement == numpy_engine.run(algorithm).total_movement
+    assert from_array.totals([algorithm]) == numpy_engine.totals([algorithm])
+
+
+def test_python_engine_with_rng_matches_numpy_engine():
+    python_engine = DiskScheduler(5000, 2000, 2500, engine='python', rng=np.random.default_rng(7))
+    numpy_engine = DiskScheduler(5000, 2000, 2500, engine='numpy', rng=np.random.default_rng(7))
+    assert isinstance(python_engine.requests, list)
+    assert python_engine.requests_digest == numpy_engine.requests_digest
+    assert python_engine.totals(list(ALGORITHMS)) == numpy_engine.totals(list(ALGORITHMS))
+
+
+def test_sstf_totals_with_many_duplicates():
+    requests = np.random.default_rng(3).integers(0, 50, size=20_000, dtype=np.int32)
+    for engine in ('python', 'numpy'):
+        scheduler = make_scheduler(engine, 50, 25, requests)
+        assert scheduler.totals(['SSTF'])['SSTF'] == scheduler.run('SSTF').total_movement
+
+
+@pytest.mark.parametrize('engine', ['python', 'numpy'])
+def test_deadline_expired_request_makes_the_elevator_jump(engine):
+    scheduler = make_scheduler(engine, 100, 50, [10, 60, 70, 80, 90])
+    # Sin vencimientos es un ascensor de una sola dirección que vuelve a empezar abajo
+    assert list(scheduler.deadline(expire_ms=1e9))[1:] == [60, 70, 80, 90, 10]
+    # La solicitud en 10 vence a los 50 ms; después de ir a 60 (60 ms) el ascensor salta a
+    # ella antes del siguiente lote, y desde ahí sigue subiendo
+    result = scheduler.deadline(expire_ms=50, fifo_batch=1)
+    assert list(result)[1:] == [60, 10, 70, 80, 90]
+    assert result.total_movement == 10 + 50 + 60 + 10 + 10
+    # Si todo vence al llegar y los lotes son de uno, se atiende en orden de llegada
+    assert scheduler.deadline(expire_ms=0, fifo_batch=1).total_movement == scheduler.run('FCFS').total_movement
+
+
+@pytest.mark.parametrize('engine', ['python', 'numpy'])
+@pytest.mark.parametrize('case', CASES[:60])
+def test_anticipatory_window_of_one_is_fcfs(case, engine):
+    scheduler = make_scheduler(engine, *case)
+    result = scheduler.anticipatory(window=1)
+    assert list(result) == list(scheduler.run('FCFS'))
+    assert result.total_movement == scheduler.run('FCFS').total_movement
+
+
+def test_deadline_reuses_the_shared_index():
+    scheduler = make_scheduler('numpy', 20, 7, [7, 7, 3, 3, 15, 15])
+    index = scheduler.workload_index
+    order = index.arrival_order(list(scheduler.requests))
+    assert [scheduler.requests[i] for i in order] == index.sorted_requests.tolist()
+    assert order == [2, 3, 0, 1, 4, 5]  # Estable: a igual cilindro, primero la más vieja
+    scheduler.deadline()
+    assert scheduler.workload_index is index and index.arrival_order(None) is order
+
+
+def test_export_round_trip(tmp_path):
+    from export import ScheduleExport, ScheduleReader, export_results
+    scheduler = make_scheduler('numpy', 200, 77, random.Random(5).choices(range(200), k=53))
+    results = {name: scheduler.run(name) for name in ('SSTF', 'SCAN', 'C-SCAN')}
+    export_results(results, str(tmp_path / 'whole'), chunk_steps=7)
+
+    # El mismo historial escrito en pedazos de tamaños que no coinciden con los trozos
+    export = ScheduleExport(str(tmp_path / 'pieces'), chunk_steps=7)
+    writer = export.writer('SSTF', initial_position=77)
+    positions = np.asarray(results['SSTF'])[1:]
+    start = 0
+    for size in [1, 0, 3, 7, 11, 2, 100]:
+        writer.write(positions[start:start + size].tolist())
+        start += size
+    writer.close()
+
+    for directory, names in (('whole', list(results)), ('pieces', ['SSTF'])):
+        reader = ScheduleReader(str(tmp_path / directory))
+        assert reader.algorithms == names
+        for name in names:
+            result = results[name]
+            expected = {'position': np.asarray(result)[1:], 'seek': result.seek_distances,
+                        'cumulative': np.cumsum(result.seek_distances)}
+            steps = len(expected['position'])
+            assert reader.num_steps(name) == steps
+            assert reader.total_movement(name) == result.total_movement
+            # Rangos dentro de un trozo, cruzando varios, y fuera del historial
+            for start, stop in [(0, None), (0, 7), (3, 5), (5, 16), (6, 8), (13, 50),
+                                (-4, 3), (steps - 2, steps + 10), (steps, steps + 3), (9, 9)]:
+                low, high = max(start, 0), steps if stop is None else min(stop, steps)
+                read = reader.read(name, start, stop)
+                for column, values in expected.items():
+                    assert read[column].tolist() == values[low:high].tolist()
+            pieces = [chunk['position'] for _, chunk in reader.iter_chunks(name, columns=('position',))]
+            assert all(len(piece) <= 7 for piece in pieces)
+            assert np.concatenate(pieces).tolist() == expected['position'].tolist()
+
+
+@pytest.mark.parametrize('seed', range(40))
+def test_optimal_movement_matches_brute_force(seed):
+    import itertools
+    from disk_scheduling import optimal_movement
+    rng = random.Random(seed)
+    head = rng.randrange(30)
+    requests = [rng.randrange(30) for _ in range(rng.randrange(7))]
+    # Atender en cualquier orden: el mejor recorrido de todas las permutaciones
+    best = min(sum(abs(b - a) for a, b in zip((head,) + order, order))
+               for order in itertools.permutations(requests))
+    assert optimal_movement(head, min(requests, default=None), max(requests, default=None)) == best
+    assert make_scheduler('python', 30, head, requests).optimal_total == best
+
+
+@pytest.mark.parametrize('engine', ['python', 'numpy'])
+@pytest.mark.parametrize('case', CASES)
+def test_every_algorithm_respects_the_optimal_bound(case, engine):
+    scheduler = make_scheduler(engine, *case)
+    bound = scheduler.optimal_total
+    for algorithm in ALGORITHMS:
+        assert scheduler.run(algorithm).total_movement >= bound, algorithm
+
+
+def _write_trace(path, rows):
+    import csv
+    import json
+    if str(path).endswith('.csv'):
+        with open(path, 'w', newline='') as trace_file:
+            writer = csv.DictWriter(trace_file, fieldnames=['time', 'lba'])
+            writer.writeheader()
+            writer.writerows(rows)
+    else:
+        with open(path, 'w') as trace_file:
+            trace_file.writelines(json.dumps(row) + '\n' for row in rows)
+
+
+@pytest.mark.parametrize('extension', ['.csv', '.jsonl'])
+@pytest.mark.parametrize('chunk_size', [1, 3, 1000])
+def test_convert_and_replay_trace(tmp_path, extension, chunk_size):
+    from traces import DiskGeometry, convert_trace, load_trace, replay_totals, scheduler_from_trace
+    geometry = DiskGeometry(num_cylinders=50, heads=2, sectors_per_track=5)
+    rng = random.Random(chunk_size)
+    lbas = [rng.randrange(geometry.num_sectors) for _ in range(11)]
+    source = tmp_path / f'trace{extension}'
+    _write_trace(source, [{'time': 0.5 * i, 'lba': lba} for i, lba in enumerate(lbas)])
+
+    destination = str(tmp_path / 'trace.npy')
+    paths = convert_trace(str(source), destination, geometry, timestamp_field='time', chunk_size=chunk_size)
+    assert paths == (destination, str(tmp_path / 'trace.timestamps.npy'))
+    assert sorted(os.listdir(tmp_path)) == sorted([source.name, 'trace.npy', 'trace.timestamps.npy'])
+
+    cylinders, timestamps = load_trace(destination, with_timestamps=True)
+    assert cylinders.dtype == np.int32 and cylinders.tolist() == [lba // 10 for lba in lbas]
+    assert timestamps.tolist() == [0.5 * i for i in range(11)]
+
+    scheduler = make_scheduler('numpy', 50, 20, [lba // 10 for lba in lbas])
+    closed_form = list(StreamingTotals.CLOSED_FORM)
+    assert replay_totals(destination, 20, 50, chunk_size=chunk_size) == scheduler.totals(closed_form)
+    assert scheduler_from_trace(destination, 20, 50).totals() == scheduler.totals()
+
+
+def test_convert_empty_trace(tmp_path):
+    from traces import DiskGeometry, convert_trace, load_trace, replay_totals
+    source = tmp_path / 'empty.csv'
+    _write_trace(source, [])
+    destination = str(tmp_path / 'empty.npy')
+    assert convert_trace(str(source), destination, DiskGeometry()) == (destination, None)
+    assert len(load_trace(destination)) == 0
+    closed_form = list(StreamingTotals.CLOSED_FORM)
+    assert replay_totals(destination, 7, 100) == make_scheduler('numpy', 100, 7, []).totals(closed_form)
+
+
+@pytest.mark.parametrize('chunk_size', [2, 1000])
+def test_convert_trace_rejects_lbas_outside_the_disk(tmp_path, chunk_size):
+    from traces import DiskGeometry, convert_trace
+    geometry = DiskGeometry(num_cylinders=10, heads=1, sectors_per_track=1)
+    source = tmp_path / 'trace.jsonl'
+    _write_trace(source, [{'time': i, 'lba': lba} for i, lba in enumerate([1, 2, 3, 4, 10])])
+    with pytest.raises(ValueError):
+        convert_trace(str(source), str(tmp_path / 'trace.npy'), geometry, timestamp_field='time',
+                      chunk_size=chunk_size)
+    # Los binarios crudos a medio escribir no quedan tirados
+    assert os.listdir(tmp_path) == ['trace.jsonl']
+
+
+@pytest.mark.parametrize('max_points', [5, 6, 50, 500])
+@pytest.mark.parametrize('length', [1, 499, 500, 501, 12_345])
+def test_downsample_extremes_keeps_the_extremes(max_points, length):
+    visualizations = pytest.importorskip('visualizations')
+    rng = np.random.default_rng(length)
+    values = rng.integers(100, 200, size=length)
+    values[length // 3] = 10_000  # Un pico de una sola muestra
+    values[length // 2] = 0       # Un salto de vuelta al cilindro 0, como en C-SCAN
+    x, y = visualizations.downsample_extremes(values, max_points)
+
+    assert len(x) <= max_points
+    assert np.all(np.diff(x) > 0) and y.tolist() == values[x].tolist()
+    assert x[0] == 0 and x[-1] == length - 1
+    assert {length // 3, length // 2} <= set(x.tolist())
+
+
+def test_downsample_extremes_keeps_the_c_scan_wrap():
+    visualizations = pytest.importorskip('visualizations')
+    scheduler = make_scheduler('numpy', 5000, 2500, random.Random(3).choices(range(5000), k=20_000))
+    result = scheduler.run('C-SCAN')
+    x, y = visualizations.downsample_extremes(result, 100)
+    assert len(x) <= 100
+    positions = np.asarray(result)
+    wrap = int(np.argmax(np.diff(positions) < 0)) + 1
+    assert positions[wrap - 1] == 4999 and positions[wrap] == 0
+    # El salto queda entero en la muestra: el punto anterior al 0 sigue siendo el final del disco
+    assert {0, wrap, len(positions) - 1} <= set(x.tolist())
+    sample = x.tolist().index(wrap)
+    assert y[sample - 1] == 4999 and y[sample] == 0
+
+
+def test_sweep_table_shows_every_percentile():
+    from sweep import format_sweep_table, run_sweep, summarize_sweep
+    percentiles = (50, 99.9, 12.5)
+    rows = summarize_sweep(run_sweep([100], [20], [0, 50], range(4), max_workers=1), percentiles)
+    header = format_sweep_table(rows, percentiles).splitlines()[0].split()
+    assert header[-3:] == ['p50', 'p99.9', 'p12.5']
+    assert all(len(line.split()) == len(header) for line in format_sweep_table(rows, percentiles).splitlines())
+
+
+def test_run_sweep_does_not_depend_on_the_workers():
+    from sweep import run_sweep
+    arguments = ([100, 300], [1, 40], [0, 99], range(3))
+    serial = run_sweep(*arguments, algorithms=list(ALGORITHMS), max_workers=1)
+    assert run_sweep(*arguments, algorithms=list(ALGORITHMS), max_workers=3) == serial
+    assert len(serial) == 2 * 2 * 2 * 3
@@ -0,0 +1,188 @@
+"""
+Reproducción de trazas reales de bloques en vez de cargas aleatorias
+Convierte una traza CSV/JSONL (una vez) a un archivo binario .npy con el cilindro de
+cada solicitud, y después la lee con memoria mapeada para alimentar a los planificadores
+por trozos, sin armar nunca una lista de Python con todas las solicitudes
+"""
+
+import contextlib
+import csv
+import json
+import os
+
+import numpy as np
+
+from disk_scheduling import DiskScheduler, StreamingTotals
+
+
+# Cuántas filas de la traza se procesan juntas al convertir o reproducir
+DEFAULT_CHUNK_SIZE = 1_000_000
+
+
+class DiskGeometry:
+    """
+    Geometría del disco usada para pasar de LBA (número de sector lógico) a cilindro
+
+    Con la geometría clásica CHS, un cilindro tiene heads × sectors_per_track sectores,
+    así que cilindro = LBA // (heads × sectors_per_track).
+    """
+
+    def __init__(self, num_cylinders=5000, heads=16, sectors_per_track=63):
+        self.num_cylinders = num_cylinders
+        self.heads = heads
+        self.sectors_per_track = sectors_per_track
+
+    @property
+    def sectors_per_cylinder(self):
+        return self.heads * self.sectors_per_track
+
+    @property
+    def num_sectors(self):
+        """Capacidad del disco en sectores"""
+        return self.num_cylinders * self.sectors_per_cylinder
+
+    def lba_to_cylinder(self, lbas):
+        """
+        Convierte un arreglo de LBAs en cilindros (int32)
+
+        Lanza ValueError si algún LBA no cabe en el disco, para no recortar
+        la traza en silencio con una geometría equivocada.
+        """
+        lbas = np.asarray(lbas, dtype=np.int64)
+        if len(lbas) and (lbas.min() < 0 or lbas.max() >= self.num_sectors):
+            raise ValueError(f"Hay LBAs fuera del disco (0 - {self.num_sectors - 1}); revisa la geometría")
+        return (lbas // self.sectors_per_cylinder).astype(np.int32)
+
+
+def timestamps_path(trace_path):
+    """Ruta del archivo de tiempos de llegada que acompaña a una traza convertida"""
+    root, _ = os.path.splitext(trace_path)
+    return root + '.timestamps.npy'
+
+
+def _iter_rows(source):
+    """Recorre las filas de una traza CSV o JSONL como diccionarios"""
+    extension = os.path.splitext(source)[1].lower()
+    with open(source, newline='') as trace_file:
+        if extension == '.csv':
+            yield from csv.DictReader(trace_file)
+        elif extension in ('.jsonl', '.json'):
+            for line in trace_file:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            raise ValueError(f"Formato de traza no soportado: {extension!r} (usa .csv o .jsonl)")
+
+
+def _raw_to_npy(raw_path, destination, dtype, count, chunk_size):
+    """Copia un archivo binario crudo a un .npy por trozos (sin cargarlo entero)"""
+    raw = np.memmap(raw_path, dtype=dtype, mode='r', shape=(count,)) if count else np.empty(0, dtype)
+    output = np.lib.format.open_memmap(destination, mode='w+', dtype=dtype, shape=(count,))
+    for start in range(0, count, chunk_size):
+        output[start:start + chunk_size] = raw[start:start + chunk_size]
+    output.flush()
+    del output, raw
+    os.remove(raw_path)
+
+
+def convert_trace(source, destination, geometry, lba_field='lba', timestamp_field=None,
+                  chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Lee una traza CSV/JSONL una sola vez y la guarda como .npy de cilindros int32
+
+    Parámetros:
+        source: Ruta de la traza (.csv con encabezado o .jsonl con un objeto por línea)
+        destination: Ruta del .npy de salida
+        geometry: DiskGeometry usada para convertir LBA a cilindro
+        lba_field: Nombre de la columna/clave con el LBA
+        timestamp_field: Columna/clave con el tiempo de llegada (opcional); si se da,
+            se guarda también un .timestamps.npy de float64 al lado
+        chunk_size: Filas que se acumulan antes de escribir
+
+    Retorna:
+        Una tupla (ruta_cilindros, ruta_tiempos_o_None)
+    """
+    # Como no sabemos cuántas filas hay hasta terminar, primero escribimos binario
+    # crudo y al final lo pasamos a .npy (que necesita el tamaño en el encabezado)
+    raw_cylinders = destination + '.part'
+    raw_timestamps = destination + '.timestamps.part' if timestamp_field else None
+    count = 0
+
+    try:
+        with contextlib.ExitStack() as stack:
+            cylinders_file = stack.enter_context(open(raw_cylinders, 'wb'))
+            timestamps_file = stack.enter_context(open(raw_timestamps, 'wb')) if raw_timestamps else None
+            lbas, timestamps = [], []
+
+            def flush():
+                geometry.lba_to_cylinder(lbas).tofile(cylinders_file)
+                if timestamps_file is not None:
+                    np.asarray(timestamps, dtype=np.float64).tofile(timestamps_file)
+                lbas.clear()
+                timestamps.clear()
+
+            for row in _iter_rows(source):
+                lbas.append(int(row[lba_field]))
+                if timestamp_field:
+                    timestamps.append(float(row[timestamp_field]))
+                count += 1
+                if len(lbas) >= chunk_size:
+                    flush()
+            flush()
+
+        _raw_to_npy(raw_cylinders, destination, np.int32, count, chunk_size)
+        if raw_timestamps:
+            _raw_to_npy(raw_timestamps, timestamps_path(destination), np.float64, count, chunk_size)
+    finally:
+        # Si algo falló a mitad (un LBA fuera del disco, una fila rota) no dejamos los
+        # binarios crudos; después de _raw_to_npy ya no existen
+        for raw_path in (raw_cylinders, raw_timestamps):
+            if raw_path and os.path.exists(raw_path):
+                os.remove(raw_path)
+    return destination, (timestamps_path(destination) if raw_timestamps else None)
+
+
+def load_trace(path, with_timestamps=False):
+    """
+    Abre una traza convertida con memoria mapeada (no se lee a RAM hasta que se usa)
+
+    Retorna:
+        El arreglo de cilindros, o una tupla (cilindros, tiempos) si with_timestamps=True
+    """
+    cylinders = np.load(path, mmap_mode='r')
+    if not with_timestamps:
+        return cylinders
+    return cylinders, np.load(timestamps_path(path), mmap_mode='r')
+
+
+def iter_chunks(array, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Recorre un arreglo (o memmap) en vistas consecutivas de chunk_size elementos"""
+    for start in range(0, len(array), chunk_size):
+        yield array[start:start + chunk_size]
+
+
+def replay_totals(path, initial_position, num_cylinders, algorithms=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Movimiento total de cada algoritmo sobre una traza, leyéndola por trozos
+
+    Solo usa las fórmulas de StreamingTotals, así que la memoria no depende del
+    tamaño de la traza.
+
+    Retorna:
+        Un diccionario {algoritmo: movimiento_total}
+    """
+    stream = StreamingTotals(initial_position, num_cylinders)
+    for chunk in iter_chunks(load_trace(path), chunk_size):
+        stream.feed(chunk)
+    return stream.totals(algorithms)
+
+
+def scheduler_from_trace(path, initial_position, num_cylinders, engine='numpy'):
+    """
+    Crea un DiskScheduler cuyas solicitudes son la traza mapeada en memoria
+
+    Los algoritmos que ordenan (SCAN, SSTF, ...) sí copian la carga al ordenarla;
+    FCFS y totals() la recorren directamente desde el archivo.
+    """
+    return DiskScheduler(num_cylinders, initial_position=initial_position, engine=engine,
+                         requests=load_trace(path))
@@ -3,18 +3,129 @@ Visualization module for Disk Scheduling Algorithms
 Creates graphs showing performance comparison and head movement
 """
 
+import hashlib
+import json
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+
 import matplotlib.pyplot as plt
 import numpy as np
 from disk_scheduling import DiskScheduler
+from instrumentation import NULL_INSTRUMENTATION
 import matplotlib.patches as mpatches
 
 
+# One color per algorithm, in the order returned by run_all_algorithms
+ALGORITHM_COLORS = ['#FF6B6B', '#F7B267', '#4ECDC4', '#9B5DE5', '#45B7D1', '#2A9D8F',
+                    '#E76F51', '#8D99AE']
+
+
+def algorithm_colors(algorithms):
+    """Return a color for each algorithm, cycling the palette if there are more algorithms"""
+    return [ALGORITHM_COLORS[i % len(ALGORITHM_COLORS)] for i in range(len(algorithms))]
+
+
+def downsample_extremes(values, max_points=500):
+    """
+    Reduce a long series to about max_points points without losing its extremes
+    
+    The series is split into equal buckets and the minimum and maximum of each bucket
+    are kept (plus the first and last points), so sweep endpoints and jumps such as the
+    C-SCAN return to cylinder 0 survive. Everything is done with vectorized NumPy
+    operations on a reshaped view; nothing is copied into Python lists.
+    
+    Returns:
+        (x_indices, y_values) as NumPy arrays, with x_indices sorted
+    """
+    y = np.asarray(values)
+    n = len(y)
+    if n <= max_points:
+        return np.arange(n), y
+    
+    # Two points per bucket, leaving room for the first/last point and the tail bucket
+    num_buckets = max(1, (max_points - 4) // 2)
+    bucket_size = -(-n // num_buckets)
+    full = (n // bucket_size) * bucket_size
+    
+    buckets = y[:full].reshape(-1, bucket_size)
+    offsets = np.arange(0, full, bucket_size)
+    parts = [buckets.argmin(axis=1) + offsets, buckets.argmax(axis=1) + offsets, [0, n - 1]]
+    if full < n:
+        tail = y[full:]
+        parts.append([full + tail.argmin(), full + tail.argmax()])
+    
+    x_indices = np.unique(np.concatenate(parts))
+    return x_indices, y[x_indices]
+
+
+class PlotPayload:
+    """
+    Small, picklable stand-in for a ScheduleResult holding only what the plots draw
+    
+    Sending these to worker processes instead of full histories keeps the per-figure
+    payload at a few kilobytes no matter how many requests were simulated.
+    """
+    
+    __slots__ = ('algorithm', 'total_movement', 'mean_seek', 'sample_x', 'sample_y')
+    
+    def __init__(self, algorithm, total_movement, mean_seek, sample_x, sample_y):
+        self.algorithm = algorithm
+        self.total_movement = total_movement
+        self.mean_seek = mean_seek
+        self.sample_x = sample_x
+        self.sample_y = sample_y
+
+
+def reduce_results(results, num_requests, max_points=500):
+    """Pre-reduce every result to a PlotPayload (totals, mean seek and a downsampled history)"""
+    payloads = {}
+    for algorithm, result in results.items():
+        if isinstance(result, PlotPayload):
+            payloads[algorithm] = result
+            continue
+        sample_x, sample_y = downsample_extremes(result, max_points)
+        payloads[algorithm] = PlotPayload(algorithm, result.total_movement,
+                                          _mean_seek(result, num_requests),
+                                          sample_x, np.array(sample_y))
+    return payloads
+
+
+def summarize_scheduler(scheduler):
+    """Picklable copy of the scheduler parameters the plots print"""
+    return SimpleNamespace(num_cylinders=scheduler.num_cylinders,
+                           num_requests=scheduler.num_requests,
+                           initial_position=scheduler.initial_position,
+                           optimal_total=scheduler.optimal_total)
+
+
+def _head_samples(result, max_points):
+    """Downsampled (x, y) head positions of a ScheduleResult or PlotPayload"""
+    if isinstance(result, PlotPayload):
+        return result.sample_x, result.sample_y
+    return downsample_extremes(result, max_points)
+
+
+def _mean_seek(result, num_requests):
+    """
+    Average cylinders moved per request of a ScheduleResult or PlotPayload
+    
+    Divides by num_requests rather than the number of steps, like
+    ScheduleResult.average_service_ms, so SCAN and C-SCAN are not flattered by their
+    trips to the disk ends.
+    """
+    if isinstance(result, PlotPayload):
+        return result.mean_seek
+    return result.total_movement / num_requests if num_requests > 0 else 0
+
+
 def plot_comparison_bar(scheduler, results):
     """Create bar chart comparing total movement of algorithms"""
     algorithms = list(results.keys())
-    movements = [results[alg][0] for alg in algorithms]
+    movements = [results[alg].total_movement for alg in algorithms]
     
-    colors = ['#FF6B6B', '#4ECDC4', '#45B7D1']
+    colors = algorithm_colors(algorithms)
     plt.figure(figsize=(10, 6))
     bars = plt.bar(algorithms, movements, color=colors, edgecolor='black', linewidth=2, width=0.6)
     
@@ -37,23 +148,22 @@ def plot_comparison_bar(scheduler, results):
 
 def plot_head_position_movements(scheduler, results, max_points=500):
     """Create line plots showing head position over time for each algorithm"""
-    fig, axes = plt.subplots(1, 3, figsize=(18, 5))
-    colors = ['#FF6B6B', '#4ECDC4', '#45B7D1']
-    
     algorithms = list(results.keys())
+    colors = algorithm_colors(algorithms)
+    
+    # Three plots per row, as many rows as needed
+    ncols = min(3, len(algorithms))
+    nrows = (len(algorithms) + ncols - 1) // ncols
+    fig, axes = plt.subplots(nrows, ncols, figsize=(6 * ncols, 5 * nrows), squeeze=False)
+    axes = axes.ravel()
+    for ax in axes[len(algorithms):]:
+        ax.axis('off')
     
     for idx, (ax, algorithm, color) in enumerate(zip(axes, algorithms, colors)):
-        positions = results[algorithm][1]
-        total_movement = results[algorithm][0]
+        total_movement = results[algorithm].total_movement
         
-        # Sample points if too many (for cleaner visualization)
-        if len(positions) > max_points:
-            sample_indices = np.linspace(0, len(positions) - 1, max_points, dtype=int)
-            sampled_positions = [positions[i] for i in sample_indices]
-            x_data = sample_indices
-        else:
-            sampled_positions = positions
-            x_data = range(len(positions))
+        # Reduce long histories while keeping sweep endpoints and jumps
+        x_data, sampled_positions = _head_samples(results[algorithm], max_points)
         
         ax.plot(x_data, sampled_positions, color=color, linewidth=1.5, alpha=0.8)
         ax.scatter(x_data[0], sampled_positions[0], color='green', s=100, zorder=5, label='Start', marker='o')
@@ -74,17 +184,15 @@ def plot_head_position_movements(scheduler, results, max_points=500):
 def plot_performance_metrics(scheduler, results):
     """Create a more detailed performance comparison visualization"""
     algorithms = list(results.keys())
-    movements = [results[alg][0] for alg in algorithms]
+    movements = [results[alg].total_movement for alg in algorithms]
     
     # Calculate additional metrics
     avg_movements = []
     for algorithm in algorithms:
-        positions = results[algorithm][1]
-        movements_list = [abs(positions[i] - positions[i-1]) for i in range(1, len(positions))]
-        avg_movements.append(np.mean(movements_list) if movements_list else 0)
+        avg_movements.append(_mean_seek(results[algorithm], scheduler.num_requests))
     
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 5))
-    colors = ['#FF6B6B', '#4ECDC4', '#45B7D1']
+    colors = algorithm_colors(algorithms)
     
     # Total movement
     bars1 = ax1.bar(algorithms, movements, color=colors, edgecolor='black', linewidth=2, width=0.6)
@@ -113,30 +221,34 @@ def plot_performance_metrics(scheduler, results):
 
 
 def plot_efficiency_comparison(scheduler, results):
-    """Create a visualization comparing efficiency of algorithms"""
+    """Create a visualization comparing each algorithm against the optimal offline bound"""
+    from disk_scheduling import overhead_percent
     algorithms = list(results.keys())
-    movements = [results[alg][0] for alg in algorithms]
+    movements = [results[alg].total_movement for alg in algorithms]
+    optimal = scheduler.optimal_total
     
-    # Normalize to percentage (best algorithm = 100%)
-    best_movement = min(movements)
-    efficiency = [100 * (best_movement / m) for m in movements]
+    # Normalize to percentage (optimal bound = 100%)
+    efficiency = [100 * (optimal / m) if m else 100.0 for m in movements]
+    overheads = [overhead_percent(m, optimal) for m in movements]
     
     fig, ax = plt.subplots(figsize=(10, 6))
-    colors = ['#FF6B6B', '#4ECDC4', '#45B7D1']
+    colors = algorithm_colors(algorithms)
     
     bars = ax.barh(algorithms, efficiency, color=colors, edgecolor='black', linewidth=2, height=0.6)
     
-    # Add percentage labels
-    for bar, eff in zip(bars, efficiency):
+    # Add percentage labels with the overhead over the bound
+    for bar, eff, overhead in zip(bars, efficiency, overheads):
         width = bar.get_width()
+        overhead_label = 'n/a' if overhead is None else f'+{overhead:.2f}%'
         ax.text(width, bar.get_y() + bar.get_height()/2.,
-               f'{eff:.1f}%',
+               f'{eff:.1f}% ({overhead_label})',
                ha='left', va='center', fontsize=12, fontweight='bold', bbox=dict(boxstyle='round', facecolor='white', alpha=0.8))
     
-    ax.set_xlabel('Efficiency (relative to best algorithm)', fontsize=12, fontweight='bold')
-    ax.set_title(f'Algorithm Efficiency Comparison\n(100% = Best performing algorithm)',
+    ax.set_xlabel('Efficiency (relative to optimal offline bound)', fontsize=12, fontweight='bold')
+    ax.set_title(f'Algorithm Efficiency Comparison\n(100% = optimal bound of {optimal} cylinders; '
+                 f'overhead in parentheses)',
                 fontsize=13, fontweight='bold')
-    ax.set_xlim(0, 110)
+    ax.set_xlim(0, 130)
     ax.grid(axis='x', alpha=0.3, linestyle='--')
     
     plt.tight_layout()
@@ -146,12 +258,12 @@ def plot_efficiency_comparison(scheduler, results):
 def create_summary_report(scheduler, results):
     """Create a comprehensive summary report visualization"""
     algorithms = list(results.keys())
-    movements = [results[alg][0] for alg in algorithms]
+    movements = [results[alg].total_movement for alg in algorithms]
     
     fig = plt.figure(figsize=(14, 8))
     gs = fig.add_gridspec(2, 2, hspace=0.3, wspace=0.3)
     
-    colors = ['#FF6B6B', '#4ECDC4', '#45B7D1']
+    colors = algorithm_colors(algorithms)
     
     # 1. Main comparison (large, top-left and right)
     ax1 = fig.add_subplot(gs[0, :])
@@ -206,6 +318,8 @@ def create_summary_report(scheduler, results):
     
     Difference: {int(movements[worst_idx] - movements[best_idx])} cylinders
     Improvement: {((movements[worst_idx] - movements[best_idx]) / movements[worst_idx] * 100):.1f}%
+    
+    Optimal Bound: {scheduler.optimal_total} cylinders
     """
     
     ax3.text(0.1, 0.5, stats_text, transform=ax3.transAxes,
@@ -218,61 +332,186 @@ def create_summary_report(scheduler, results):
     return fig
 
 
-def save_all_plots(scheduler, results, output_dir='results'):
-    """Save all plots to files"""
-    import os
+# Figures written by save_all_plots: (file name without extension, plotting function)
+STANDARD_PLOTS = [
+    ('1_comparison_bar', 'plot_comparison_bar'),
+    ('2_head_movements', 'plot_head_position_movements'),
+    ('3_performance_metrics', 'plot_performance_metrics'),
+    ('4_efficiency_comparison', 'plot_efficiency_comparison'),
+    ('5_summary_report', 'create_summary_report'),
+]
+
+# Instrumentation report written next to the plots when it is enabled
+INSTRUMENTATION_REPORT = 'instrumentation.json'
+
+# Per-directory record of the input hash of every figure, used to skip unchanged plots
+MANIFEST_NAME = '.plot_hashes.json'
+
+# Default render pool: one process per standard figure, capped by the available cores
+DEFAULT_PLOT_WORKERS = min(len(STANDARD_PLOTS), os.cpu_count() or 1)
+
+
+def use_headless_backend():
+    """Switch matplotlib to the non-interactive Agg backend (no display needed)"""
+    plt.switch_backend('Agg')
+
+
+def _render_job(job):
+    """Render one figure to disk; runs in the main process or in a worker"""
+    function_name, args, path, dpi = job
+    fig = globals()[function_name](*args)
+    fig.savefig(path, dpi=dpi, bbox_inches='tight')
+    plt.close(fig)
+    return path
+
+
+def _job_digest(job, fmt):
+    """Hash of everything that determines a figure's pixels"""
+    function_name, args, _, dpi = job
+    return hashlib.sha256(pickle.dumps((function_name, args, dpi, fmt), protocol=4)).hexdigest()
+
+
+def render_jobs(jobs, output_dir, fmt='png', workers=None, skip_unchanged=True):
+    """
+    Render a list of (function_name, args, path, dpi) jobs, optionally in a process pool
     
+    Jobs whose input hash matches the manifest (and whose file still exists) are skipped.
+    The manifest keeps the entries of figures that are not part of this call, so forced
+    re-renders of one set of plots do not invalidate the others.
+    Worker processes always use the Agg backend; workers defaults to DEFAULT_PLOT_WORKERS.
+    """
+    if workers is None:
+        workers = DEFAULT_PLOT_WORKERS
+    manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+    manifest = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as manifest_file:
+            manifest = json.load(manifest_file)
+    
+    pending = []
+    for job in jobs:
+        path = job[2]
+        digest = _job_digest(job, fmt)
+        if skip_unchanged and manifest.get(os.path.basename(path)) == digest and os.path.exists(path):
+            print(f"↷ Unchanged, skipped: {path}")
+            continue
+        manifest[os.path.basename(path)] = digest
+        pending.append(job)
+    
+    if workers > 1 and len(pending) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(pending)),
+                                 initializer=use_headless_backend) as executor:
+            for path in executor.map(_render_job, pending):
+                print(f"✓ Saved: {path}")
+    else:
+        for job in pending:
+            print(f"✓ Saved: {_render_job(job)}")
+    
+    with open(manifest_path, 'w') as manifest_file:
+        json.dump(manifest, manifest_file, indent=2, sort_keys=True)
+
+
+def save_all_plots(scheduler, results, output_dir='results', fmt='png', dpi=300, workers=None,
+                   headless=False, skip_unchanged=True):
+    """
+    Save all plots to files
+    
+    Parameters:
+        fmt: Image format passed to savefig ('png', 'svg', 'pdf', ...)
+        dpi: Resolution of raster formats
+        workers: Number of processes used to render the figures in parallel
+            (default DEFAULT_PLOT_WORKERS; 1 renders in this process)
+        headless: Force the Agg backend in this process too (batch nodes without a display)
+        skip_unchanged: Do not re-render figures whose input data hash has not changed
+    
+    If the scheduler has instrumentation enabled, the plotting time is recorded as the
+    'plots' phase and the report is written to INSTRUMENTATION_REPORT in output_dir.
+    """
     # Create results directory if it doesn't exist
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
+    if headless:
+        use_headless_backend()
     
     print(f"\nSaving visualizations to '{output_dir}/' directory...")
     
-    # Plot 1: Bar chart comparison
-    fig1 = plot_comparison_bar(scheduler, results)
-    fig1.savefig(f'{output_dir}/1_comparison_bar.png', dpi=300, bbox_inches='tight')
-    print(f"✓ Saved: {output_dir}/1_comparison_bar.png")
+    # Each figure gets the scheduler parameters and the pre-reduced results only
+    instrumentation = getattr(scheduler, 'instrumentation', NULL_INSTRUMENTATION)
+    with instrumentation.phase('plots'):
+        summary = summarize_scheduler(scheduler)
+        payloads = reduce_results(results, scheduler.num_requests)
+        jobs = [(function_name, (summary, payloads), os.path.join(output_dir, f'{name}.{fmt}'), dpi)
+                for name, function_name in STANDARD_PLOTS]
+        render_jobs(jobs, output_dir, fmt, workers, skip_unchanged)
+    if instrumentation.enabled:
+        instrumentation.write_json(os.path.join(output_dir, INSTRUMENTATION_REPORT))
     
-    # Plot 2: Head position movements
-    fig2 = plot_head_position_movements(scheduler, results)
-    fig2.savefig(f'{output_dir}/2_head_movements.png', dpi=300, bbox_inches='tight')
-    print(f"✓ Saved: {output_dir}/2_head_movements.png")
-    
-    # Plot 3: Performance metrics
-    fig3 = plot_performance_metrics(scheduler, results)
-    fig3.savefig(f'{output_dir}/3_performance_metrics.png', dpi=300, bbox_inches='tight')
-    print(f"✓ Saved: {output_dir}/3_performance_metrics.png")
-    
-    # Plot 4: Efficiency comparison
-    fig4 = plot_efficiency_comparison(scheduler, results)
-    fig4.savefig(f'{output_dir}/4_efficiency_comparison.png', dpi=300, bbox_inches='tight')
-    print(f"✓ Saved: {output_dir}/4_efficiency_comparison.png")
-    
-    # Plot 5: Summary report
-    fig5 = create_summary_report(scheduler, results)
-    fig5.savefig(f'{output_dir}/5_summary_report.png', dpi=300, bbox_inches='tight')
-    print(f"✓ Saved: {output_dir}/5_summary_report.png")
-    
-    plt.close('all')
     print(f"\n✓ All visualizations saved successfully!\n")
 
 
+def plot_sweep_scenario(scenario, rows):
+    """Bar chart of mean total movement (± std) per algorithm for one sweep scenario"""
+    num_cylinders, num_requests, initial_position = scenario
+    algorithms = [row['algorithm'] for row in rows]
+    means = [row['mean'] for row in rows]
+    stds = [row['std'] for row in rows]
+    
+    fig, ax = plt.subplots(figsize=(10, 6))
+    ax.bar(algorithms, means, yerr=stds, capsize=6, color=algorithm_colors(algorithms),
+           edgecolor='black', linewidth=2, width=0.6)
+    ax.set_ylabel('Mean Total Head Movement (cylinders)', fontsize=12, fontweight='bold')
+    ax.set_title(f'Sweep Scenario - {num_requests} requests, {num_cylinders} cylinders, '
+                 f'head at {initial_position}\n({rows[0]["runs"]} runs per algorithm)',
+                 fontsize=13, fontweight='bold')
+    ax.grid(axis='y', alpha=0.3, linestyle='--')
+    plt.tight_layout()
+    return fig
+
+
+def save_sweep_plots(summary_rows, output_dir='results/sweep', fmt='png', dpi=150, workers=None,
+                     headless=True, skip_unchanged=True):
+    """Save one figure per scenario of a sweep summary (see sweep.summarize_sweep)"""
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+    if headless:
+        use_headless_backend()
+    
+    scenarios = {}
+    for row in summary_rows:
+        scenario = (row['num_cylinders'], row['num_requests'], row['initial_position'])
+        scenarios.setdefault(scenario, []).append(row)
+    
+    jobs = [('plot_sweep_scenario', (scenario, rows),
+             os.path.join(output_dir, 'sweep_{}cyl_{}req_{}pos.{}'.format(*scenario, fmt)), dpi)
+            for scenario, rows in scenarios.items()]
+    render_jobs(jobs, output_dir, fmt, workers, skip_unchanged)
+
+
 def main():
     """Main function for visualization"""
+    import random
     from disk_scheduling import DiskScheduler, print_results
     
     # Parameters
     NUM_CYLINDERS = 5000
     NUM_REQUESTS = 1000
     INITIAL_POSITION = 2500
+    SEED = None  # An integer makes the workload reproducible, and only then worth caching
     
     print("\nGenerating disk scheduling scenario...")
     print(f"Disk cylinders: 0 - {NUM_CYLINDERS - 1}")
     print(f"Number of requests: {NUM_REQUESTS}")
     print(f"Initial head position: {INITIAL_POSITION}\n")
     
+    # A fresh random workload never repeats, so caching it would only fill the disk
+    cache = None
+    if SEED is not None:
+        from result_cache import ResultCache
+        random.seed(SEED)
+        cache = ResultCache()
+    
     # Create scheduler and run algorithms
-    scheduler = DiskScheduler(NUM_CYLINDERS, NUM_REQUESTS, INITIAL_POSITION)
+    scheduler = DiskScheduler(NUM_CYLINDERS, NUM_REQUESTS, INITIAL_POSITION, cache=cache)
     results = scheduler.run_all_algorithms()
     
     # Print results